@@ -0,0 +1,80 @@
+"""Multi-resolution clustering of the case map.
+
+Located cases are summed on square grids, one per zoom level, the cell
+side halving from one level to the next. The pyramid is computed once per
+data version; a view of the map only carries the cells of the level whose
+cells are about CELL_PX wide on screen, and only those inside the view. The
+payload is thus bounded by the view size in cells, however many locations
+the data holds.
+"""
+import numpy as np
+import pandas as pd
+
+# Cell side of level 0, in degrees; Senegal spans about 6 x 4.5 degrees
+BASE_CELL = 2.0
+LEVELS = 8
+
+# Target cell side on screen, and circle sizes, in pixels
+CELL_PX = 40
+MIN_SIZE = 8
+MAX_SIZE = 40
+
+
+def cell_size(level):
+    return BASE_CELL / 2 ** level
+
+
+def _level(points, level, name, weight):
+    size = cell_size(level)
+    cells = points.assign(
+        ix=np.floor(points['longitude'] / size).astype(np.int64),
+        iy=np.floor(points['latitude'] / size).astype(np.int64),
+        wx=points['longitude'] * points[weight],
+        wy=points['latitude'] * points[weight],
+    )
+    groups = cells.groupby(['ix', 'iy'], sort=False)
+    summed = groups[['wx', 'wy', weight]].sum()
+    # Points come largest first: cells are named after their largest location
+    largest = groups[name].first()
+    locations = groups.size()
+
+    level_cells = pd.DataFrame({
+        'longitude': summed['wx'] / summed[weight],
+        'latitude': summed['wy'] / summed[weight],
+        weight: summed[weight],
+        'locations': locations,
+    })
+    labels = largest.reindex(level_cells.index).astype(str)
+    more = level_cells['locations'] > 1
+    labels[more] = labels[more] + " +" + (level_cells['locations'][more] - 1).astype(str)
+    level_cells[name] = labels
+    return level_cells.reset_index(drop=True)
+
+
+def pyramid(points, name='Ville', weight='Positif', levels=LEVELS):
+    """Cells of each level: case-weighted centre, summed `weight`, number of
+    locations, and a label in the `name` column."""
+    points = points.dropna(subset=['longitude', 'latitude'])
+    points = points[points[weight] > 0]
+    # Counts stay integers, as they are shown in the tooltips
+    points = points.assign(**{name: points[name].astype(str), weight: points[weight].astype(np.int64)})
+    points = points.sort_values(weight, ascending=False, kind='mergesort')
+    return [_level(points, level, name, weight) for level in range(levels)]
+
+
+def level_for(bounds, width, levels=LEVELS):
+    """Level whose cells are about CELL_PX wide when `bounds` span `width` pixels."""
+    wanted = (bounds[2] - bounds[0]) * CELL_PX / width
+    return int(np.clip(np.floor(np.log2(BASE_CELL / wanted)), 0, levels - 1))
+
+
+def view(levels, bounds, width, weight='Positif'):
+    """Cells of the matching level inside `bounds` (x0, y0, x1, y1), with a
+    circle 'size' growing with the square root of `weight`."""
+    cells = levels[level_for(bounds, width, len(levels))]
+    largest = cells[weight].max() if len(cells) else 1
+    x0, y0, x1, y1 = bounds
+    inside = cells['longitude'].between(x0, x1) & cells['latitude'].between(y0, y1)
+    cells = cells[inside].copy()
+    cells['size'] = MIN_SIZE + (MAX_SIZE - MIN_SIZE) * np.sqrt(cells[weight] / largest)
+    return cells
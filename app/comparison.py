@@ -0,0 +1,115 @@
+"""Comparison of the Senegal curve with other countries.
+
+Cumulative case counts of other countries are bundled in
+country_series.csv (one row per Pays and Date); adding a country is adding
+its rows. All curves are handled as one Day x Pays matrix, so comparing
+with 50 countries costs the same handful of array operations as with one.
+"""
+import altair as alt
+import numpy as np
+import pandas as pd
+
+import data
+
+SERIES_FILE = "country_series.csv"
+SENEGAL = "Senegal"
+
+# Lags tried when matching the Senegal curve, and days both curves must
+# share for a lag to be considered
+MAX_LAG = 60
+MIN_OVERLAP = 7
+
+
+def _load(path):
+    series = pd.read_csv(path, parse_dates=['Date'])
+    return series.pivot_table(index='Date', columns='Pays', values='Cas', aggfunc='max')
+
+
+def load(path=SERIES_FILE):
+    """Cumulative cases per Date (rows) and Pays (columns)."""
+    return data.cached("comparison.series", lambda: _load(path), path)
+
+
+def matrix(path=data.DATA_FILE, series_file=SERIES_FILE):
+    """Senegal and the bundled countries on a common calendar."""
+    countries = load(series_file)
+    senegal = data.evolution(path)['Positif'].rename(SENEGAL)
+    wide = pd.concat([senegal, countries], axis=1).sort_index()
+    dates = pd.date_range(wide.index.min(), wide.index.max())
+    wide = wide.reindex(dates)
+    # Cumulative counts: a day without report between two reports keeps the
+    # previous total; before the first and after the last report nothing is known
+    inside = wide.ffill().notna() & wide.bfill().notna()
+    return wide.ffill().where(inside)
+
+
+def align(wide, threshold=1):
+    """Rows become days since each country reached `threshold` cases."""
+    values = wide.values
+    # NaN, outside a country's reports, never reaches the threshold
+    with np.errstate(invalid='ignore'):
+        reached = values >= threshold
+    has_reached = reached.any(axis=0)
+    first = np.where(has_reached, reached.argmax(axis=0), len(values))
+
+    days = np.arange(len(values))[:, None]
+    rows = first[None, :] + days
+    valid = rows < len(values)
+    aligned = np.where(valid, values[np.minimum(rows, len(values) - 1), np.arange(values.shape[1])], np.nan)
+    aligned = pd.DataFrame(aligned, columns=wide.columns)
+    aligned.index.name = 'Jour'
+    return aligned.dropna(how='all')
+
+
+def lags(wide, reference=SENEGAL, max_lag=MAX_LAG):
+    """Days by which each country's curve precedes the `reference` curve.
+
+    For every lag k in [-max_lag, max_lag] the log curve of `reference` is
+    compared with each country's log curve shifted by k days, all at once
+    on a (lag, day, country) array; the lag with the smallest mean squared
+    difference wins. Cumulative curves are all increasing and correlate
+    well at any shift, so the curves are matched on their level rather than
+    on a raw correlation coefficient. A country without any usable lag gets
+    NaN.
+    """
+    logs = np.log1p(wide.values)
+    ref = logs[:, list(wide.columns).index(reference)]
+    n = len(logs)
+    shifts = np.arange(-max_lag, max_lag + 1)
+
+    # shifted[k, t, c] = logs[t - k, c], NaN outside the series
+    index = np.arange(n)[None, :] - shifts[:, None]
+    inside = (index >= 0) & (index < n)
+    shifted = np.where(inside[:, :, None], logs[np.clip(index, 0, n - 1)], np.nan)
+
+    # Only compare where the reference epidemic has started, and on lags
+    # leaving at least MIN_OVERLAP days known on both curves
+    with np.errstate(invalid='ignore'):
+        started = ref > 0
+    squares = np.where(started[None, :, None], (shifted - ref[None, :, None]) ** 2, np.nan)
+    known = (~np.isnan(squares)).sum(axis=1)
+    errors = np.where(known >= MIN_OVERLAP, np.nansum(squares, axis=1) / np.maximum(known, 1), np.inf)
+    best = np.where(np.isfinite(errors).any(axis=0), shifts[errors.argmin(axis=0)], np.nan)
+    return pd.Series(best, index=wide.columns).drop(reference)
+
+
+def _compare(path, series_file, threshold):
+    wide = matrix(path, series_file)
+    return align(wide, threshold), lags(wide)
+
+
+def compare(threshold=1, path=data.DATA_FILE, series_file=SERIES_FILE):
+    """Curves aligned on `threshold` cases, and lags against Senegal in days."""
+    name = "comparison.%s.%d" % (data.data_version(series_file), threshold)
+    return data.cached(name, lambda: _compare(path, series_file, threshold), path)
+
+
+def chart(aligned, labels, title):
+    """Interactive chart of the aligned curves; `labels` renames countries."""
+    long = aligned.rename(columns=labels).reset_index().melt('Jour', var_name='Pays', value_name='Cas').dropna()
+    return alt.Chart(long).mark_line(size=4).encode(
+        x='Jour:Q',
+        y='Cas:Q',
+        color='Pays:N',
+        tooltip=['Pays:N', 'Jour:Q', 'Cas:Q'],
+    ).properties(title=title, height=450, width=700).interactive()
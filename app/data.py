@@ -0,0 +1,293 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import storage
+from rollup import DailyRollup
+
+DATA_FILE = "COVID_Senegal.csv"
+
+# Shared by every Streamlit session of the process: one entry per data file,
+# holding the file version and everything computed from that version.
+_cache = {}
+_lock = threading.RLock()
+
+# Cache hits and misses of the current thread, i.e. of the current session's
+# rerun under Streamlit (see instrument.py)
+stats = threading.local()
+
+# Entry each thread is building a value for, per path: a build and the
+# values it reads all belong to the version it started on (see cached)
+_bound = threading.local()
+
+
+# Values that can be brought up to date with appended rows only
+INCREMENTAL = ("rollup", "factor_counts", "ville_counts", "population_counts")
+
+
+def _fingerprint(path, prefix_size=None):
+    """SHA-1 of the file, and of its first `prefix_size` bytes if they end a line."""
+    h = hashlib.sha1()
+    prefix = None
+    with open(path, "rb") as f:
+        if prefix_size:
+            head = f.read(prefix_size)
+            h.update(head)
+            if len(head) == prefix_size and head.endswith(b"\n"):
+                prefix = h.hexdigest()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest(), prefix
+
+
+def _carry(entry):
+    """Incremental values of `entry`, with the file size they reflect."""
+    carried = dict(entry["appended"]["values"]) if entry["appended"] else {}
+    offsets = dict(entry["appended"]["offsets"]) if entry["appended"] else {}
+    for name in INCREMENTAL:
+        if name in entry["values"] and name not in entry["moved"]:
+            carried[name] = entry["values"][name]
+            offsets[name] = entry["size"]
+    return {"values": carried, "offsets": offsets} if carried else None
+
+
+def _entry(path):
+    """Return the cache entry of `path`, evicting it if the file changed."""
+    bound = getattr(_bound, "entries", {}).get(path)
+    if bound is not None:
+        return bound
+    st = os.stat(path)
+    stat = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry["stat"] == stat:
+            return entry
+        # Only hash when mtime/size moved: a touch without edit keeps the cache
+        previous = entry
+        digest, prefix = _fingerprint(path, previous["size"] if previous else None)
+        if previous is not None and previous["hash"] == digest:
+            previous["stat"] = stat
+            return previous
+        entry = {
+            "stat": stat,
+            "size": st.st_size,
+            "hash": digest,
+            "version": "%d-%s" % (st.st_mtime_ns, digest[:12]),
+            "values": {},
+            "building": {},
+            # Values whose build saw the file change, and so cannot be carried
+            "moved": set(),
+            "appended": None,
+        }
+        if previous is not None and prefix == previous["hash"]:
+            # Rows were only appended: incremental values are carried over
+            entry["appended"] = _carry(previous)
+        _cache[path] = entry
+        return entry
+
+
+def data_version(path=DATA_FILE):
+    return _entry(path)["version"]
+
+
+def content_hash(path=DATA_FILE):
+    return _entry(path)["hash"]
+
+
+def _count(hit):
+    key = "hits" if hit else "misses"
+    setattr(stats, key, getattr(stats, key, 0) + 1)
+
+
+def cached(name, builder, path=DATA_FILE):
+    """Compute `builder()` once per version of `path` and share the result.
+
+    Results are shared between sessions and must be treated as read-only.
+    Different values are built concurrently; callers asking for a value
+    being built wait for it instead of building it again.
+    """
+    entry = _entry(path)
+    values = entry["values"]
+    with _lock:
+        if name in values:
+            _count(True)
+            return values[name]
+        building = entry["building"].setdefault(name, threading.Lock())
+    with building:
+        with _lock:
+            if name in values:
+                _count(True)
+                return values[name]
+        entries = _bound.__dict__.setdefault("entries", {})
+        outer = entries.get(path)
+        entries[path] = entry
+        try:
+            value = builder()
+        finally:
+            if outer is None:
+                del entries[path]
+            else:
+                entries[path] = outer
+        st = os.stat(path)
+        with _lock:
+            values[name] = value
+            if (st.st_mtime_ns, st.st_size) != entry["stat"]:
+                entry["moved"].add(name)
+            entry["building"].pop(name, None)
+            _count(False)
+        return value
+
+
+def clear(path=None):
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+
+
+def load_cases(path=DATA_FILE):
+    """Case-level frame, memory-mapped from its Arrow copy when possible."""
+    return cached("cases", lambda: storage.load(path, content_hash(path)), path)
+
+
+def _appended(path, name):
+    """The previous version's value `name` and the rows appended since it was built.
+
+    None when `name` cannot be carried over to this version.
+    """
+    entry = _entry(path)
+    appended = entry["appended"]
+    if not appended or name not in appended["values"]:
+        return None
+    offset = appended["offsets"][name]
+    # Up to this version's size, even if the file grew since
+    rows = cached("rows_after.%d" % offset, lambda: storage.read_csv_tail(path, offset, entry["size"]), path)
+    return appended["values"][name], rows
+
+
+def _rollup(path):
+    previous = _appended(path, "rollup")
+    if previous:
+        # Another version may still be building on the same previous rollup
+        rollup, rows = previous
+        return rollup.copy().append(rows)
+    return DailyRollup().append(load_cases(path))
+
+
+def rollup(path=DATA_FILE):
+    """Per-day and cumulative counts, updated with appended rows only."""
+    return cached("rollup", lambda: _rollup(path), path)
+
+
+def _evolution(path):
+    evol_cases = rollup(path).frame()
+    evol_cases['Actifs'] = evol_cases['Positif'] - evol_cases['Guéri']
+    return evol_cases
+
+
+def evolution(path=DATA_FILE):
+    """Cumulative daily totals, plus the 'Actifs' (positive minus cured) column."""
+    return cached("evol_cases", lambda: _evolution(path), path)
+
+
+def _count_factors(rows):
+    df = rows[['Date', 'Facteur']].dropna()
+    counts = pd.crosstab(df['Date'], df['Facteur'].astype(str))
+    counts.columns.name = None
+    return counts
+
+
+def _factor_counts(path):
+    previous = _appended(path, "factor_counts")
+    if previous:
+        counts, rows = previous
+        # New dates may lack factors older dates have, and the other way round
+        merged = pd.concat([counts, _count_factors(rows)], sort=False).fillna(0)
+        return merged.groupby(level=0).sum().astype(np.int64)
+    return _count_factors(load_cases(path))
+
+
+def factor_counts(path=DATA_FILE):
+    """Cases per Date (rows) and Facteur (columns), updated with appended rows only."""
+    return cached("factor_counts", lambda: _factor_counts(path), path)
+
+
+def _contamination(path):
+    counts = factor_counts(path)
+    # Factors in order of first appearance
+    counts = counts[counts.ne(0).idxmax().sort_values(kind='mergesort').index]
+    return counts.sum(), counts.cumsum().reset_index()
+
+
+def contamination(path=DATA_FILE):
+    """Total cases per Facteur, and their cumulative count per Date (one column per Facteur)."""
+    return cached("contamination", lambda: _contamination(path), path)
+
+
+def _ville_series(path):
+    df = load_cases(path)[['Date', 'Ville', 'Positif']].dropna()
+    counts = df.pivot_table(index='Date', columns='Ville', values='Positif', aggfunc='sum', fill_value=0)
+    return counts.cumsum()
+
+
+def ville_series(path=DATA_FILE):
+    """Cumulative positive cases per Date (rows) and Ville (columns)."""
+    return cached("ville_series", lambda: _ville_series(path), path)
+
+
+def _count_villes(rows):
+    df = rows[['Ville', 'Positif']].dropna()
+    return df['Positif'].groupby(df['Ville'].astype(str)).sum().astype(np.int64)
+
+
+def _ville_counts(path):
+    previous = _appended(path, "ville_counts")
+    if previous:
+        counts, rows = previous
+        return counts.add(_count_villes(rows), fill_value=0).astype(np.int64)
+    return _count_villes(load_cases(path))
+
+
+def _summary(path):
+    counts = cached("ville_counts", lambda: _ville_counts(path), path)
+    return counts.rename_axis('Ville').reset_index()
+
+
+def city_summary(path=DATA_FILE):
+    """Number of positive cases per Ville, updated with appended rows only."""
+    return cached("summary", lambda: _summary(path), path)
+
+
+def _count_population(rows):
+    counts = {}
+    for col in ('Age', 'Temps Hospitalisation (j)'):
+        values = rows[col].dropna()
+        counts[col] = (float(values.sum()), len(values))
+    counts['sexes'] = rows[['Homme', 'Femme']].dropna().sum().astype(np.int64)
+    counts['residents'] = rows['Resident Senegal'].dropna().astype(str).value_counts()
+    return counts
+
+
+def _population_counts(path):
+    previous = _appended(path, "population_counts")
+    if not previous:
+        return _count_population(load_cases(path))
+    counts, rows = previous
+    new = _count_population(rows)
+    merged = {}
+    for col in ('Age', 'Temps Hospitalisation (j)'):
+        merged[col] = (counts[col][0] + new[col][0], counts[col][1] + new[col][1])
+    merged['sexes'] = counts['sexes'] + new['sexes']
+    residents = counts['residents'].add(new['residents'], fill_value=0).astype(np.int64)
+    merged['residents'] = residents.sort_values(ascending=False, kind='mergesort')
+    return merged
+
+
+def population_counts(path=DATA_FILE):
+    """Sum and number of the known ages and stays, totals of Homme and Femme
+    and patients per Resident Senegal answer, updated with appended rows only."""
+    return cached("population_counts", lambda: _population_counts(path), path)
@@ -0,0 +1,253 @@
+"""Static export of the dashboard, served without any Python session.
+
+The sections of app.py are computed headlessly and written, per language,
+to SITE/<langue>/page.json: Vega-Lite specs, the Bokeh map as a json_item,
+the Plotly globe, the headline numbers and the sidebar. Next to it,
+index.html draws the page in the browser with the JavaScript libraries
+kept in SITE/js, so the site loads nothing from elsewhere. BokehJS and
+Plotly.js are copied from the installed packages; marked and the Vega
+libraries are fetched once, at the exact versions of SCRIPTS. Run it
+again whenever the data changed:
+
+    python app/export.py [site]
+"""
+import json
+import os
+import shutil
+import sys
+import urllib.request
+
+import model
+from i18n import CREDITS, TEXT
+
+SITE = "site"
+DIRECTORIES = {"Français": "fr", "Wolof": "wo"}
+
+# Exact releases of the libraries the Python packages do not ship: the
+# Vega-Lite altair renders with, and vega and vega-embed of the same time
+SCRIPTS = {
+    "marked": ("4.3.0", "marked.min.js"),
+    "vega": ("5.9.0", "build/vega.min.js"),
+    "vega-lite": ("4.0.2", "build/vega-lite.min.js"),
+    "vega-embed": ("6.2.1", "build/vega-embed.min.js"),
+}
+CDN = "https://cdn.jsdelivr.net/npm/%s@%s/%s"
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>%(title)s</title>
+%(scripts)s
+<style>
+body { display: flex; margin: 0; font-family: sans-serif; }
+aside { width: 18rem; min-height: 100vh; padding: 1rem; background: #f0f2f6; }
+main { max-width: 46rem; padding: 1rem 2rem; }
+summary { font-size: 1.2em; cursor: pointer; margin: 1rem 0; }
+</style>
+</head>
+<body>
+<aside id="sidebar"></aside>
+<main id="main"></main>
+<script>
+var count = 0;
+
+function render(block, parent) {
+  var el = document.createElement("div");
+  el.id = "block" + count++;
+  parent.appendChild(el);
+  if ("markdown" in block) {
+    el.innerHTML = marked.parse(block.markdown);
+  } else if ("header" in block || "subheader" in block) {
+    var h = document.createElement("header" in block ? "h2" : "h3");
+    h.textContent = block.header || block.subheader;
+    el.appendChild(h);
+  } else if ("html" in block) {
+    el.innerHTML = block.html;
+  } else if ("vega" in block) {
+    vegaEmbed(el, block.vega, {actions: false});
+  } else if ("bokeh" in block) {
+    Bokeh.embed.embed_item(block.bokeh, el.id);
+  } else if ("plotly" in block) {
+    Plotly.newPlot(el, block.plotly.data, block.plotly.layout);
+  } else if ("section" in block) {
+    // Drawn when first opened, like the checkboxes of the app
+    var details = document.createElement("details");
+    var summary = document.createElement("summary");
+    summary.textContent = block.section;
+    details.appendChild(summary);
+    details.addEventListener("toggle", function () {
+      if (details.open && !details.drawn) {
+        details.drawn = true;
+        block.blocks.forEach(function (b) { render(b, details); });
+      }
+    });
+    el.appendChild(details);
+  }
+}
+
+fetch("page.json").then(function (r) { return r.json(); }).then(function (page) {
+  page.sidebar.forEach(function (b) { render(b, document.getElementById("sidebar")); });
+  page.main.forEach(function (b) { render(b, document.getElementById("main")); });
+});
+</script>
+</body>
+</html>
+"""
+
+
+def _markdown(text):
+    return {"markdown": text}
+
+
+def _html(df):
+    return {"html": df.to_html()}
+
+
+def sidebar(t, langue):
+    links = ["[%s](../%s/)" % (other, DIRECTORIES[other]) for other in TEXT if other != langue]
+    blocks = [_markdown(" · ".join(links)), _markdown(t["updated"] % model.last_update()), _markdown("---")]
+    blocks.append({"header": t["resources_title"]})
+    blocks += [_markdown(line) for line in t["resources"]]
+    blocks += [_markdown("---"), {"header": t["contact_title"]}]
+    blocks += [_markdown(line) for line in t["contact"]]
+    blocks += [_markdown("---"), _markdown(CREDITS)]
+    return blocks
+
+
+def main(t):
+    """Blocks of the page, in the order of app.py; sections are folded."""
+    blocks = [{"header": t["title"]}, {"subheader": t["summary"]}]
+    for title, text in t.get("intro", []):
+        blocks += [{"subheader": title}, _markdown(text)]
+    headline = model.headline()
+    for label, key in t["headline"]:
+        blocks.append(_markdown("%s: <span style='font-size:1.5em;'>%s</span>" % (label, headline[key])))
+
+    blocks.append({"section": t["map"], "blocks": [
+        {"bokeh": _bokeh(model.map_figure(t["map_tooltips"], t["regions_tooltips"]))},
+    ]})
+
+    evolution = [_markdown(t["evolution_text"]), {"vega": model.evolution_chart().to_dict()}]
+    if "fits_text" in t:
+        evolution += [_markdown(t["fits_text"]), _html(model.growth_fits().rename(columns=t["fits_columns"]))]
+    blocks.append({"section": t["evolution"], "blocks": evolution})
+
+    if "netherlands" in t:
+        chart = model.comparison_chart(t["netherlands_chart"], t["netherlands_labels"])
+        lags = [_markdown(t["netherlands_lag"] % (t["netherlands_labels"].get(country, country), lag))
+                for country, lag in model.comparison_lags().items()]
+        blocks.append({"section": t["netherlands"], "blocks": [
+            _markdown(t["netherlands_text"]), {"vega": chart.to_dict()},
+        ] + lags})
+
+    totals, chart = model.contamination()
+    title, axis = t["sources_chart"]
+    contamination = [_markdown(t["contamination_text"])]
+    contamination += [_markdown("%s %s" % (t["factors"].get(factor, t["factor_default"] % factor), total))
+                      for factor, total in totals.items()]
+    contamination += [
+        {"vega": chart.to_dict()},
+        _markdown(t["sources_text"]),
+        {"vega": model.bar_chart('Source/Voyage', title, axis).to_dict()},
+        {"section": t["globe"], "blocks": [{"plotly": json.loads(model.origin_globe().to_json())}]},
+    ]
+    blocks.append({"section": t["contamination"], "blocks": contamination})
+
+    population = model.population()
+    age_title, age_axis = t["age_chart"]
+    cities_title, cities_axis = t["cities_chart"]
+    age_before, age_after = t["age_mean"]
+    days_before, days_after = t["hospitalisation_mean"]
+    blocks.append({"section": t["population"], "blocks": [
+        _markdown(t["population_text"]),
+        _markdown("%s %s %s" % (age_before, population['age_mean'], age_after)),
+        {"vega": model.bar_chart('Age', age_title, age_axis).to_dict()},
+        _markdown(t["sexes"]),
+        _html(population['sexes']),
+        _markdown(t["cities"]),
+        {"vega": model.bar_chart('Ville', cities_title, cities_axis).to_dict()},
+        _markdown(t["residents"]),
+        _html(population['residents'].to_frame()),
+        _markdown("%s %s %s" % (days_before, population['hospitalisation_mean'], days_after)),
+    ]})
+
+    if "prevention" in t:
+        blocks += [_markdown("---"), {"subheader": t["prevention_title"]}]
+        blocks += [_markdown(line) for line in t["prevention"]]
+    return blocks
+
+
+def _bokeh(figure):
+    from bokeh.embed import json_item
+    return json_item(figure)
+
+
+def _download(url, target):
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            content = response.read()
+    except OSError as e:
+        raise OSError("%s: %s" % (url, e))
+    with open(target, "wb") as f:
+        f.write(content)
+
+
+def scripts(folder):
+    """Write the JavaScript of the page to `folder`; returns the file names, in load order.
+
+    Files are named after their version and kept from one export to the next.
+    """
+    import altair as alt
+    import bokeh
+    from bokeh.util.paths import bokehjsdir
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    # altair itself only names the major versions of vega and vega-embed
+    if alt.SCHEMA_VERSION.lstrip("v") != SCRIPTS["vega-lite"][0]:
+        raise ValueError("altair renders Vega-Lite %s, SCRIPTS has %s"
+                         % (alt.SCHEMA_VERSION, SCRIPTS["vega-lite"][0]))
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for package, (version, path) in SCRIPTS.items():
+        name = "%s-%s.min.js" % (package, version)
+        if not os.path.exists(os.path.join(folder, name)):
+            _download(CDN % (package, version, path), os.path.join(folder, name))
+        names.append(name)
+
+    name = "bokeh-%s.min.js" % bokeh.__version__
+    shutil.copyfile(os.path.join(bokehjsdir(), "js", "bokeh.min.js"), os.path.join(folder, name))
+    names.append(name)
+
+    name = "plotly-%s.min.js" % get_plotlyjs_version()
+    with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+    names.append(name)
+    return names
+
+
+def export(site=SITE):
+    """Write the page of every language under `site`; returns the files written."""
+    names = scripts(os.path.join(site, "js"))
+    tags = "\n".join('<script src="../js/%s"></script>' % name for name in names)
+    written = [os.path.join(site, "js", name) for name in names]
+    for langue, t in TEXT.items():
+        folder = os.path.join(site, DIRECTORIES[langue])
+        os.makedirs(folder, exist_ok=True)
+        page = {"langue": langue, "sidebar": sidebar(t, langue), "main": main(t)}
+        with open(os.path.join(folder, "page.json"), "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        with open(os.path.join(folder, "index.html"), "w", encoding="utf-8") as f:
+            f.write(PAGE % {"title": t["title"], "scripts": tags})
+        written += [os.path.join(folder, "page.json"), os.path.join(folder, "index.html")]
+
+    # The site root opens the first language
+    with open(os.path.join(site, "index.html"), "w", encoding="utf-8") as f:
+        f.write('<meta http-equiv="refresh" content="0; url=%s/">' % DIRECTORIES[next(iter(TEXT))])
+    return written + [os.path.join(site, "index.html")]
+
+
+if __name__ == "__main__":
+    for path in export(*sys.argv[1:2]):
+        print("Wrote %s (%d bytes)" % (path, os.path.getsize(path)))
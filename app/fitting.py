@@ -0,0 +1,176 @@
+"""Logistic and exponential growth fits of cumulative case counts.
+
+Fits are memoized on a hash of the input series, so an unchanged region is
+never refitted, and start from the parameters found for the same region
+last time (stored in FIT_STATE), which are close to the solution when the
+series only grew by a day. When enough regions need a fit, they are
+spread over a process pool that lives as long as the server. Its workers
+are spawned rather than forked: fit() runs on the warm-up threads, and a
+fork taken while another thread holds a lock can leave the child stuck.
+"""
+import collections
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+
+FIT_STATE = "fit_params.json"
+
+# Regions need at least that many days with cases to be fitted
+MIN_POINTS = 5
+HORIZON = 7
+MEMO_SIZE = 512
+
+# Below that many fits, starting workers (and scipy in them) costs more
+# than fitting in the calling thread
+POOL_THRESHOLD = 8
+
+_memo = collections.OrderedDict()
+_lock = threading.Lock()
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def logistic(t, K, r, t0):
+    return K / (1 + np.exp(-r * (t - t0)))
+
+
+def exponential(t, a, r):
+    return a * np.exp(r * t)
+
+
+MODELS = {
+    'logistic': logistic,
+    'exponential': exponential,
+}
+
+
+def _initial(model, t, y):
+    if model == 'logistic':
+        return [2 * y[-1], 0.2, t[-1]]
+    return [max(y[0], 1), 0.1]
+
+
+def _bounds(model, y):
+    if model == 'logistic':
+        return [y[-1], 0, 0], [np.inf, 5, np.inf]
+    return [0, 0], [np.inf, 5]
+
+
+def fit_one(task):
+    """Fit one model to one series; runs in the worker processes."""
+    region, model, t, y, p0 = task
+    from scipy.optimize import curve_fit
+
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    lower, upper = _bounds(model, y)
+    # Yesterday's parameters can fall outside today's bounds (K below the new maximum)
+    p0 = np.clip(p0 or _initial(model, t, y), lower, upper)
+    try:
+        params, _ = curve_fit(MODELS[model], t, y, p0=p0, bounds=(lower, upper), maxfev=5000)
+    except (RuntimeError, ValueError):
+        return region, model, None
+    r = params[1]
+    return region, model, {
+        'params': [float(p) for p in params],
+        'doubling_time': float(np.log(2) / r) if r > 0 else None,
+        'projection': float(MODELS[model](t[-1] + HORIZON, *params)),
+    }
+
+
+def _key(region, model, t, y):
+    h = hashlib.sha1(np.asarray(t, dtype=float).tobytes())
+    h.update(np.asarray(y, dtype=float).tobytes())
+    h.update(("%s/%s/%d" % (region, model, HORIZON)).encode())
+    return h.hexdigest()
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def _save_state(path, state):
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _pool(processes):
+    """The process pool of `processes` workers, started on first use."""
+    with _pools_lock:
+        if processes not in _pools:
+            _pools[processes] = concurrent.futures.ProcessPoolExecutor(
+                processes, mp_context=multiprocessing.get_context("spawn"))
+        return _pools[processes]
+
+
+def _drop_pool(processes):
+    with _pools_lock:
+        pool = _pools.pop(processes, None)
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def fit(series, models=tuple(MODELS), processes=None, state_file=FIT_STATE):
+    """Fit `models` to each cumulative series of `series` (region -> pd.Series by date).
+
+    Returns {region: {model: result or None}}, where a result holds the
+    fitted 'params', the 'doubling_time' in days and the value projected
+    HORIZON days after the last point.
+    """
+    results = collections.defaultdict(dict)
+    tasks = []
+    state = _load_state(state_file)
+    for region, values in series.items():
+        values = values[values > 0]
+        # A flat series has no growth rate to speak of
+        if len(values) < MIN_POINTS or values.nunique() < 3:
+            continue
+        # Days since the region's first case, stable as new days arrive
+        t = (values.index - values.index[0]).days.values.tolist()
+        y = values.values.tolist()
+        for model in models:
+            key = _key(region, model, t, y)
+            with _lock:
+                if key in _memo:
+                    _memo.move_to_end(key)
+                    results[region][model] = _memo[key]
+                    continue
+            p0 = state.get(region, {}).get(model)
+            tasks.append((key, (region, model, t, y, p0)))
+
+    fitted = None
+    if len(tasks) >= POOL_THRESHOLD and processes != 1:
+        try:
+            fitted = list(_pool(processes).map(fit_one, [task for _, task in tasks]))
+        except concurrent.futures.BrokenExecutor:
+            _drop_pool(processes)
+    if fitted is None:
+        fitted = [fit_one(task) for _, task in tasks]
+
+    for (key, _), (region, model, result) in zip(tasks, fitted):
+        results[region][model] = result
+        with _lock:
+            _memo[key] = result
+            while len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+        if result is not None:
+            state.setdefault(region, {})[model] = result['params']
+    if tasks:
+        _save_state(state_file, state)
+    return dict(results)
@@ -0,0 +1,103 @@
+"""Offline gazetteer mapping the Ville column to coordinates.
+
+Coordinates come from city_coordinates.csv, extended by the local cache
+gazetteer.csv (entries there take precedence). Names are matched once
+normalized, so "Thiès", "thies" and "Saint-Louis"/"Saint Louis" agree.
+
+    python app/gazetteer.py missing              # Villes without coordinates
+    python app/gazetteer.py add Kaolack 14.15 -16.07
+    python app/gazetteer.py geocode              # fill missing ones with Nominatim
+"""
+import os
+import sys
+import time
+import unicodedata
+
+import pandas as pd
+
+import data
+
+SEED_FILE = "city_coordinates.csv"
+CACHE_FILE = "gazetteer.csv"
+COUNTRY = "Senegal"
+
+
+def normalize(names):
+    """Vectorized key used for matching: no accents, case or separators."""
+    names = pd.Series(names, dtype=object).fillna("").astype(str)
+    keys = names.map(lambda x: unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode())
+    return keys.str.lower().str.replace(r"[\s\-_'.]+", " ", regex=True).str.strip()
+
+
+def _read(path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['Ville', 'Latitude', 'Longitude'])
+    return pd.read_csv(path)[['Ville', 'Latitude', 'Longitude']]
+
+
+def _build(seed, cache):
+    table = pd.concat([_read(seed), _read(cache)], ignore_index=True)
+    table['key'] = normalize(table['Ville']).values
+    # Cache entries come last and win over the seed
+    table = table.drop_duplicates('key', keep='last').set_index('key')
+    return table[['Latitude', 'Longitude']].astype(float)
+
+
+def load(seed=SEED_FILE, cache=CACHE_FILE):
+    """Coordinates indexed by normalized name."""
+    if not os.path.exists(cache):
+        return data.cached("gazetteer", lambda: _build(seed, cache), seed)
+    # Re-read whenever the seed or the local cache changes
+    return data.cached("gazetteer_%s" % data.data_version(cache), lambda: _build(seed, cache), seed)
+
+
+def locate(names, seed=SEED_FILE, cache=CACHE_FILE):
+    """Latitude/longitude for each name (NaN when unknown), aligned on `names`."""
+    names = pd.Series(names)
+    coords = load(seed, cache).reindex(normalize(names).values)
+    coords.index = names.index
+    coords.columns = ['latitude', 'longitude']
+    return coords
+
+
+def unmatched(names, seed=SEED_FILE, cache=CACHE_FILE):
+    names = pd.Series(names).dropna().drop_duplicates()
+    known = normalize(names).isin(load(seed, cache).index).values
+    return sorted(names[~known])
+
+
+def add(name, latitude, longitude, cache=CACHE_FILE):
+    row = pd.DataFrame([[name, float(latitude), float(longitude)]], columns=['Ville', 'Latitude', 'Longitude'])
+    row.to_csv(cache, mode='a', header=not os.path.exists(cache), index=False)
+
+
+def geocode(names, cache=CACHE_FILE, delay=1):
+    """Look up `names` with Nominatim and store the hits in the local cache.
+
+    Only meant to be run by hand, never from the app: it needs network access
+    and Nominatim's policy allows at most one request per second.
+    """
+    from geopy.geocoders import Nominatim
+
+    geolocator = Nominatim(user_agent="covid-19-senegal")
+    found = []
+    for name in names:
+        location = geolocator.geocode(name + ", " + COUNTRY)
+        if location is not None:
+            add(name, location.latitude, location.longitude, cache)
+            found.append(name)
+        time.sleep(delay)
+    return found
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "missing"
+    if command == "add":
+        add(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        missing = unmatched(data.load_cases()['Ville'])
+        if command == "geocode":
+            found = geocode(missing)
+            missing = [name for name in missing if name not in found]
+        for name in missing:
+            print(name)
@@ -0,0 +1,72 @@
+"""Senegal boundary used by the map.
+
+The boundary is extracted from the Natural Earth shapefile once, simplified
+and written to a small GeoJSON file. The app only reads that file, and falls
+back to geopandas when it is missing or built from another shapefile:
+
+    python app/geo.py
+"""
+import json
+import os
+
+import data
+
+SHAPEFILE = 'app/ne_110m_admin_0_countries.shp'
+ARTIFACT = 'app/senegal.geojson'
+COUNTRY = "Senegal"
+
+# Degrees; ~1km, well below what the 700px wide map can show
+TOLERANCE = 0.01
+PRECISION = 4
+
+
+def _round(coords):
+    if isinstance(coords[0], (int, float)):
+        return [round(c, PRECISION) for c in coords]
+    return [_round(c) for c in coords]
+
+
+def build(shapefile=SHAPEFILE, artifact=ARTIFACT, tolerance=TOLERANCE):
+    import geopandas as gpd
+
+    gdf = gpd.read_file(shapefile)[['ADMIN', 'ADM0_A3', 'geometry']]
+    gdf.columns = ['country', 'country_code', 'geometry']
+    gdf = gdf[gdf['country'] == COUNTRY]
+    gdf['geometry'] = gdf['geometry'].simplify(tolerance, preserve_topology=True)
+
+    geojson = json.loads(gdf.to_json())
+    for feature in geojson['features']:
+        feature['geometry']['coordinates'] = _round(feature['geometry']['coordinates'])
+        feature.pop('bbox', None)
+    geojson.pop('bbox', None)
+    geojson['build'] = {
+        'source': data.content_hash(shapefile),
+        'tolerance': tolerance,
+    }
+
+    with open(artifact, 'w') as f:
+        json.dump(geojson, f, separators=(',', ':'))
+    return geojson
+
+
+def _load(shapefile, artifact):
+    geojson = None
+    if os.path.exists(artifact):
+        with open(artifact) as f:
+            geojson = json.load(f)
+    build_info = (geojson or {}).get('build', {})
+    fresh = (build_info.get('source') == data.content_hash(shapefile)
+             and build_info.get('tolerance') == TOLERANCE)
+    if not fresh:
+        geojson = build(shapefile, artifact)
+    return json.dumps(geojson)
+
+
+def senegal_geojson(shapefile=SHAPEFILE, artifact=ARTIFACT):
+    """GeoJSON string of the Senegal boundary, ready for GeoJSONDataSource."""
+    return data.cached("geojson", lambda: _load(shapefile, artifact), shapefile)
+
+
+if __name__ == "__main__":
+    geojson = build()
+    print("Wrote %s (%d bytes)" % (ARTIFACT, os.path.getsize(ARTIFACT)))
@@ -0,0 +1,166 @@
+"""Strings of the Français and Wolof views.
+
+Both views render the same model (see model.py); a key missing from a
+language, e.g. "intro" or "netherlands", hides the matching section.
+"""
+
+CREDITS = "By [Maël Fabien](https://maelfabien.github.io/), [Papa Sega](https://github.com/papasega/), [Dakar Institute of Technology](https://dit.sn/)"
+
+TEXT = {
+    "Français": {
+        "title": "COVID-19 au Sénégal 🇸🇳",
+        "updated": "*Dernière mise à jour: %s*",
+        "resources_title": "Ressources utiles",
+        "resources": [
+            "Numéro d'urgence 1: **78 172 10 81**",
+            "Numéro d'urgence 2: **76 765 97 31**",
+            "Numéro d'urgence 3: **70 717 14 92**",
+            "Numéro Vert du Ministère: **800 00 50 50**",
+            "Samu: **1515**",
+            "Service USSD: **#2121#**",
+            "[Testez vos symptomes sur Prevcovid19](http://www.prevcovid19.com/#/teste)",
+            "[Tweets du Ministère de la Santé](https://twitter.com/MinisteredelaS1)",
+            "[Base de données et code de l'application](https://github.com/maelfabien/COVID-19-Senegal)",
+        ],
+        "contact_title": "Contacter le Ministère",
+        "contact": [
+            "Ministère de la santé et de l'Action Sociale / Fann Résidence",
+            "Rue Aimé Césaire, Dakar, Sénégal",
+            "+221 800 00 50 50 - contact@sante.gouv.sn",
+        ],
+        "summary": "En bref",
+        "headline": [
+            ("Nombre de malades", "malades"),
+            ("Nombre de décès", "deces"),
+            ("Nombre de guérisons", "gueris"),
+            ("Pourcentage de guerison", "pct_guerison"),
+            ("Taux de croissance journalier lissé sur les 2 derniers jours", "croissance"),
+            ("Nombre total de cas positifs", "positifs"),
+            ("Nombre de tests negatifs", "negatifs"),
+            ("Nombre de tests réalisés", "tests"),
+            ("Pourcentage de tests positifs", "pct_positifs"),
+        ],
+        "map": "Carte des cas positifs",
+        "map_zone": "Zone",
+        "map_zoom_note": "La molette agrandit la carte sans détailler les regroupements de cas: pour les voir de plus près, choisissez une région dans *Zone*.",
+        "map_tooltips": [("Ville", "@Ville"), ("Nombre de cas positifs (au moins)", "@Positif")],
+        "regions_tooltips": [("Région", "@Region"), ("Nombre de cas positifs (au moins)", "@Positif"), ("Cas pour 100 000 habitants", "@rate")],
+        "evolution": "Evolution du nombre de cas positifs au Sénégal",
+        "evolution_text": "La courbe 'Positif' représente l'ensemble des cas, et la courbe 'Actifs' élimine les cas guéris et représente le nombre de cas actifs.",
+        "fits_text": "Ajustement de modèles logistique et exponentiel aux cas positifs cumulés, pour le pays et par ville: temps de doublement (en jours) et nombre de cas projeté dans 7 jours.",
+        "fits_columns": {
+            "logistic_doubling_time": "Doublement, logistique (j)",
+            "logistic_projection": "Projection à 7 jours, logistique",
+            "exponential_doubling_time": "Doublement, exponentiel (j)",
+            "exponential_projection": "Projection à 7 jours, exponentiel",
+        },
+        "contamination": "Contamination",
+        "contamination_text": "Nous distinguon les cas importés (voyageurs en provenance de l'extérieur) des cas contact qui ont été en contact avec une personne malade. Les cas Communauté sont des cas dont les contacts directs ne peuvent être établis, et donc les plus dangereux.",
+        "factors": {
+            "Importé": "Nombre total de cas importés: ",
+            "Contact": "Nombre total de cas contact: ",
+            "Communauté": "Nombre total de cas communauté: ",
+        },
+        "factor_default": "Nombre total de cas %s: ",
+        "sources_text": "Les cas importés, ayant ensuite crée des cas contact, proviennent des pays suivants:",
+        "sources_chart": ("Provenance des malades", "Nombre de patients"),
+        "globe": "Visualisation interactive de la provenance des cas de COVID-19:",
+        "population": "Population touchée",
+        "population_text": "Les chiffres présentés ci-dessous tiennent compte des publication du Ministère de la Santé et de l'Action Sociale. Certaines données sont manquantes, et nous n'affichons que les valeurs connues à ce jour.",
+        "age_mean": ("1. L'age moyen des patients est de ", " ans"),
+        "age_chart": ("Age des patients ", "Nombre de patients"),
+        "sexes": "2. La plupart des patients connus sont des hommes",
+        "cities": "3. La plupart des cas sont concentrés à Dakar",
+        "cities_chart": ("Ville des cas", "Nombre de patients"),
+        "residents": "4. La plupart des personnes malades résident au Sénégal",
+        "hospitalisation_mean": ("5. Le temps d'hospitalisation moyen pour le moment est de : ", " jours"),
+    },
+    "Wolof": {
+        "title": "Xibaar yu aju ci Jangorëy Koronaa ci Senegal 🇸🇳",
+        "updated": "*Yeesal gu muj: %s*",
+        "resources_title": "Ressources utiles",
+        "resources": [
+            "Numero ngir wotee bu jamp 1: **78 172 10 81**",
+            "Numero ngir wotee bu jamp 2: **76 765 97 31**",
+            "Numero ngir wotee bu jamp 3: **70 717 14 92**",
+            "Numero boye wotee tee do fayye: **800 00 50 50**",
+            "SAMU: **1515**",
+            "Besel ci sa telefone: **#2121#**",
+            "[Saytul sa yarame ci Jangoroji ci Prevcovid19](http://www.prevcovid19.com/#/teste)",
+            "[Tweetru ministre gi eub walu wergu yaram](https://twitter.com/MinisteredelaS1)",
+            "[Booleb xeeti mbir ak màndargaay jumtukaayu](https://github.com/maelfabien/COVID-19-Senegal)",
+        ],
+        "contact_title": "Jokko ak wa ministere",
+        "contact": [
+            "Ministre gi eub walu wergu yaram ak boolem boko / Fann Residence",
+            "Rue Aimé Césaire, Dakar, Sénégal",
+            "+221 800 00 50 50 - contact@sante.gouv.sn",
+        ],
+        "summary": "Ci lu gaaw",
+        "intro": [
+            ("Lan môy CORONAVIRUS 🦠?",
+             "CORONAVIRUS dá dajalee yaneen xeeti VIRUS yuñ mëna wállántee çii ay nit ak ay Mala.🐃 Liñ mënë môdinee, ci dômu âdama yi, xeetu CORONAVIRUS yi mon-na sabab tawatı noy-yi🤧 yüy jeexital thim söthie ak yeeneen xéti woppi noy-yi yu thiosano peńku (MERS) andank mandargay pút gúy meetti di xasan (SRAS). CORONA bumúja féñ môy waral tawati CORONAVIRUS ñu guën kô xam ci Covid-19."),
+            ("Lan môy Covid-19 ?",
+             "Covid-19 täwatt lä júy Wä-lee laa . Dômu DianGoro CORONAVIRUS bî moudiee féñ môkoy sabab. Dômu diangoro diouyeess jôju ak tawat jôju xameesu lénwon mânâm , keenna xamouko won la ndiague müy féñ çä diwanu Wuhan ca sîn ci weeru deesabar (decembre) atum 2019."),
+        ],
+        "headline": [
+            ("Limu ñi feebar", "malades"),
+            ("Limu ñi faatu", "deces"),
+            ("Limu ñi wer", "gueris"),
+            ("Dayob ñi wer", "pct_guerison"),
+            ("Dayob yoqute ñi feebar bis bu ay", "croissance"),
+            ("Mboolem ñi ame Koronaa", "positifs"),
+            ("Mboolem ñi ñu saytu te ñu mùcc ci feebar bi", "negatifs"),
+            ("Mboolem ñi ñu saytu", "tests"),
+            ("Dayob ñi ame feebar bi ci ñi ñu saytu", "pct_positifs"),
+        ],
+        "map": "Ñi ame feebar bi fu ñu feete",
+        "map_zone": "Diwaan",
+        "map_zoom_note": "Molette bi dafay yaatal kart bi waaye du xàjjale mbooloo yi: ngir gis leen bu baax, tànnal benn diwaan ci *Diwaan*.",
+        "map_tooltips": [("Dëkk", "@Ville"), ("Limu ñi feebar", "@Positif")],
+        "regions_tooltips": [("Diwaan", "@Region"), ("Limu ñi feebar", "@Positif"), ("Ci 100 000 nit", "@rate")],
+        "evolution": "Yoqqute limu ñi ame Koronaa",
+        "evolution_text": "Yoqqute 'Positif' mi mooy wanee ñi amee jagorogui ñeup, ak yoqqute 'Actifs' mi mooy wañi ñigua xamane tanee wer ñañu teey nataal limu ñu 'actifs'.",
+        "fits_text": "Ñaari xayma (logistique ak exponentiel) ci mboolem ñi ame Koronaa, ci reew mi ak ci dëkk bu nekk: ñaata fan la lim bi di ñaaral, ak lim bi ñu xaar ci juroom ñaari fan.",
+        "fits_columns": {
+            "logistic_doubling_time": "Ñaaral, logistique (fan)",
+            "logistic_projection": "Ci juroom ñaari fan, logistique",
+            "exponential_doubling_time": "Ñaaral, exponentiel (fan)",
+            "exponential_projection": "Ci juroom ñaari fan, exponentiel",
+        },
+        "netherlands": "Meengële ak reewu Pays-Bas",
+        "netherlands_text": "Senegal reewle bigua xamane tane limu wëy dëkkee dafa meggo ak reewu Pays-bas (lu eup Fukk ak jurrom benn million), ba taxna a meengële meuna dox di diggënte ñaari dëkk yooyee. Donete yoqqute Jangorëy Koronaa gi ci reewum Senegaal la geune yeexee ci cunu jooni yalla taye, luñu setlu ci ni Jangoro gi di doxee diarna bayi xel wayee itameu lathena ñu xalateci bu bax. Fi gua xamenee mome leu rewu Senegaal tolu ci Jangorëy Koronaa dafa mengo ci fukki fan ak juroom ci ginaaw fi reew mi di Pays-Bas tolone, wayee xayma gogu boye seteu juroom ñaari faneule ngir rew Pays-bas tee ci Senegaal fukki fan ak juroom ñeet. Lim yii aju ci reewu  Pays-Bas ñuguiko jeulé ci Wikipedia: https://en.wikipedia.org/wiki/2020_coronavirus_pandemic_in_the_Netherlands. ",
+        "netherlands_chart": "Yoqqute limu ñi ame Koronaa ci Senegal ak ci Pays-bas",
+        "netherlands_labels": {"Netherlands": "Pays-Bas", "Senegal": "Sénégal"},
+        "netherlands_lag": "Ci lim yi, %s dafa jiitu Senegaal %d fan.",
+        "contamination": "Tassarok Jangorogui",
+        "contamination_text": "Ñugui xamee ñeneu ñu jeulee Jangoroji ci ñu juguee bimeu rew, ci niit ñu feebar yigua xamené ño waleu ñeni niit. Limu ñigua xamné ño ameu Jangoroji tee jeuléko ci biir rewmi, moye waleu gi geuna ragalu ci walantee Jangoroji.",
+        "factors": {
+            "Importé": "Limu ñu idy jangorogui ci reewmi : ",
+            "Contact": "Limu ñi jangorogui dalee ci reewmi Nombre total de cas contact: ",
+            "Communauté": "Limu ñi ame koronaa ci aye mbollo: ",
+        },
+        "factor_default": "Limu ñi %s: ",
+        "sources_text": "Ñu dieulee Jangoroji bitimeu rew, tee waleu Jangoroji ñeneu ñu dëkk Senegaal, Ñugui jugué ci rew yi  : Italie, Farass, Espaañ, Angaleteer",
+        "sources_chart": ("Fi aji tawategui sokeeko", "Limu aji wopgui"),
+        "globe": "Natalu feega xamenee fila jangorey koronaa bi juguee",
+        "population": "Way-dëkk ñu feebar daleu.",
+        "population_text": "Limyi ñu jeufediko mougui juguee ci lu minitere buye saytu lu aju ci waalu wergu yaraam di feeñal ci aye diotaayame bess bu diot ngir xibaaree askanew Senegal lu aju ci jagorëy koronaa bi ci Senegal.",
+        "age_mean": ("1. At ñu eupe  ci yi Jangoroji di diap ", " ans"),
+        "age_chart": ("Atu aji wop gi", "Limu ñi feebar"),
+        "sexes": "2. Ñu eup ci aji-wop yi aye goor lañu",
+        "cities": "3.  Ñu eupe ci ñu feebar bi diapeu ndakaru lañu dëkkee",
+        "cities_chart": ("Dëkku aji wopjii", "Limu ñi feebar"),
+        "residents": "4.  Ñu eupe ci niit ñu amé Jangoroji Senegaal lañu dëkk.",
+        "hospitalisation_mean": ("5. Faan ñigua xamné aji wop gi ci laye teud lalu opital: ", " faan"),
+        "prevention_title": "Ngir fagaru ci jangoro koronã bi ",
+        "prevention": [
+            "1. Nä ngay raxass säy loxo ak ndox ak saabu ak oddu sawel bamu sett 👌 ",
+            "2. Nä ngay moytu saafanto bubari bi si waxtu wii🤝",
+            "3. Nä ngay faral di ñandu ak di tisli si mussuwár",
+            "4. Dëll moytu di lál säyy bët,👀 wala sunu guëmëñ👄 wala sä bakän👃🏽",
+            "5. Nañiy moytu didajalo don mbôlô👨‍👩‍👦‍👦",
+            "6.Nañuy faral didiw sel hydro alcolique sisunuy loxo",
+        ],
+    },
+}
@@ -0,0 +1,211 @@
+"""Watch mode: bring open sessions up to date when case rows are appended.
+
+A background thread polls the data file and the drop directory INCOMING.
+CSV files dropped there (same columns as COVID_Senegal.csv, written as
+*.part and renamed to *.csv once complete) are validated against
+schema.py, their valid rows appended to the data file and the file moved
+to INCOMING/done, the rejected rows being kept in INCOMING/rejected.
+
+Whenever the data file changed, the headline numbers and the evolution are
+brought up to date once and every open session of the Streamlit server is
+asked to rerun. Nothing is sent to the browsers while the data does not
+change, and the rerun only reads the shared cache. When rows were only
+appended, the daily rollup, the counts per Facteur and per Ville and the
+population counts only read the new rows (see data.py). The case frame and
+what is drawn from it (bar charts, globe, growth fits) are rebuilt from the
+whole file, in the background by warmup.py.
+
+Enabled in the app by setting COVID_WATCH=1. The drop directory can also
+be ingested on its own:
+
+    python app/ingest.py            # watch until interrupted
+    python app/ingest.py once       # ingest the dropped files and exit
+"""
+import csv
+import glob
+import io
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pandas as pd
+
+import data
+import model
+import schema
+
+ENABLED = os.environ.get("COVID_WATCH", "") not in ("", "0")
+INCOMING = "incoming"
+
+# Seconds between two polls of the files
+INTERVAL = 2
+
+_lock = threading.Lock()
+_state = {"thread": None, "stat": None}
+
+
+def _read(source):
+    # Kept as text, so that accepted rows are written back exactly as received
+    return pd.read_csv(source, sep=";", encoding="utf-8-sig", dtype=str, keep_default_na=False)
+
+
+def validate(rows):
+    """Mask of the rows passing every check of schema.py, `rows` being read as text.
+
+    New values of Facteur are accepted: the checks only report them.
+    """
+    failed, _ = schema.check(rows)
+    return ~schema.errors(failed).any(axis=1)
+
+
+def _header(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return f.readline().rstrip("\r\n").split(";")
+
+
+def _line_end(path):
+    with open(path, "rb") as f:
+        return "\r\n" if f.readline().endswith(b"\r\n") else "\n"
+
+
+def append(rows, path=data.DATA_FILE):
+    """Append `rows` (text, any column order) to the data file in one write,
+    ending lines like the file does."""
+    line_end = _line_end(path)
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=";", lineterminator=line_end).writerows(rows[_header(path)].values.tolist())
+    text = buffer.getvalue()
+    size = os.path.getsize(path)
+    if size:
+        with open(path, "rb") as f:
+            f.seek(size - 1)
+            # The original file does not end with a newline
+            if f.read(1) != b"\n":
+                text = line_end + text
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def _move(source, folder, name, rows=None):
+    os.makedirs(folder, exist_ok=True)
+    target = os.path.join(folder, name)
+    if rows is None:
+        shutil.move(source, target)
+    else:
+        rows.to_csv(target, sep=";", index=False)
+
+
+def _claim(source, incoming):
+    """Move `source` to INCOMING/processing for this process only.
+
+    Returns the new path, or None when another process claimed it first.
+    """
+    folder = os.path.join(incoming, "processing")
+    os.makedirs(folder, exist_ok=True)
+    claimed = os.path.join(folder, "%d-%s" % (os.getpid(), os.path.basename(source)))
+    try:
+        os.rename(source, claimed)
+    except FileNotFoundError:
+        return None
+    return claimed
+
+
+def ingest_file(source, path=data.DATA_FILE, incoming=INCOMING, name=None):
+    """Append the valid rows of `source`; returns (accepted, rejected) row counts.
+
+    `source` ends up in INCOMING/done (or INCOMING/rejected) as `name`,
+    its own file name by default.
+    """
+    name = name or os.path.basename(source)
+    rows = _read(source)
+    missing = set(_header(path)) - set(rows.columns)
+    if missing:
+        print("%s: missing columns %s" % (name, ", ".join(sorted(missing))), file=sys.stderr)
+        _move(source, os.path.join(incoming, "rejected"), name)
+        return 0, len(rows)
+
+    valid = validate(rows)
+    if valid.any():
+        append(rows[valid], path)
+    if not valid.all():
+        _move(source, os.path.join(incoming, "rejected"), name, rows[~valid])
+    _move(source, os.path.join(incoming, "done"), name)
+    return int(valid.sum()), int((~valid).sum())
+
+
+def ingest(path=data.DATA_FILE, incoming=INCOMING):
+    """Ingest the files of the drop directory, oldest name first.
+
+    Only *.csv files are read: writers must write under another name (e.g.
+    *.csv.part) and rename the finished file. Each file is claimed with a
+    rename before it is read, so that several watching processes never
+    append the same file twice.
+    """
+    for source in sorted(glob.glob(os.path.join(incoming, "*.csv"))):
+        claimed = _claim(source, incoming)
+        if claimed is None:
+            continue
+        accepted, rejected = ingest_file(claimed, path, incoming, os.path.basename(source))
+        print("%s: %d rows added, %d rejected" % (source, accepted, rejected), file=sys.stderr)
+
+
+def _rerun_sessions():
+    """Ask every open session of the Streamlit server of this process to rerun."""
+    try:
+        from streamlit.server.Server import Server
+        server = Server.get_current()
+    except (ImportError, RuntimeError):
+        # Not running under `streamlit run`
+        return
+    # Sessions must be driven from the server's main thread
+    for info in list(server._session_infos.values()):
+        server._ioloop.add_callback(info.session.request_rerun)
+
+
+def refresh(path=data.DATA_FILE):
+    """Update the live numbers after the data file changed, then rerun the sessions."""
+    model.headline(path)
+    model.last_update(path)
+    model.evolution_chart(path)
+    _rerun_sessions()
+
+
+def poll(path=data.DATA_FILE, incoming=INCOMING):
+    """One round of the watcher: ingest dropped files, refresh if the file changed.
+
+    Rows written to the data file by hand need no check here: every read of
+    the file drops or clears what fails the checks of schema.py, and the
+    next full read lists them in the report (see storage.py).
+    """
+    if os.path.isdir(incoming):
+        ingest(path, incoming)
+    st = os.stat(path)
+    previous, _state["stat"] = _state["stat"], (st.st_mtime_ns, st.st_size)
+    if previous is not None and previous != _state["stat"]:
+        refresh(path)
+
+
+def _watch(path, incoming, interval):
+    while True:
+        try:
+            poll(path, incoming)
+        except (OSError, ValueError, KeyError) as e:
+            print("watch: %s" % e, file=sys.stderr)
+        time.sleep(interval)
+
+
+def start(path=data.DATA_FILE, incoming=INCOMING, interval=INTERVAL):
+    """Start the watcher thread of the process, once."""
+    with _lock:
+        if _state["thread"] is None:
+            _state["thread"] = threading.Thread(target=_watch, args=(path, incoming, interval), daemon=True)
+            _state["thread"].start()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["once"]:
+        ingest()
+    else:
+        _watch(data.DATA_FILE, INCOMING, INTERVAL)
@@ -0,0 +1,88 @@
+"""Opt-in timing and memory instrumentation of the dashboard sections.
+
+Enabled by setting COVID_DEBUG=1. Each rerun then records, per section,
+the wall time, the peak of Python allocations and the data cache hits and
+misses, shows them in a sidebar panel and appends them as one JSON line to
+COVID_DEBUG_LOG (logs/timings.jsonl by default).
+"""
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+import data
+
+ENABLED = os.environ.get("COVID_DEBUG", "") not in ("", "0")
+LOG_FILE = os.environ.get("COVID_DEBUG_LOG", "logs/timings.jsonl")
+
+_local = threading.local()
+_log_lock = threading.Lock()
+_trace_lock = threading.Lock()
+
+if ENABLED:
+    tracemalloc.start()
+
+
+def start_run(**context):
+    """Forget the previous rerun of this session; `context` is logged with it."""
+    _local.context = context
+    _local.sections = []
+
+
+def _cache_counts():
+    return getattr(data.stats, "hits", 0), getattr(data.stats, "misses", 0)
+
+
+@contextlib.contextmanager
+def section(name):
+    if not ENABLED:
+        yield
+        return
+    hits, misses = _cache_counts()
+    # tracemalloc.reset_peak() needs Python 3.9; restarting forgets the
+    # peak along with the earlier traces. Tracing is process-wide:
+    # concurrent sessions can inflate the peak, or restart it
+    with _trace_lock:
+        tracemalloc.stop()
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        after_hits, after_misses = _cache_counts()
+        _local.sections.append({
+            "section": name,
+            "seconds": round(seconds, 4),
+            "peak_mb": round(peak / 2 ** 20, 2),
+            "cache_hits": after_hits - hits,
+            "cache_misses": after_misses - misses,
+        })
+
+
+def finish_run(sidebar):
+    """Show this rerun's records in `sidebar` and append them to the log."""
+    if not ENABLED:
+        return
+    record = dict(_local.context)
+    record["time"] = datetime.datetime.now().isoformat(timespec="seconds")
+    record["data_version"] = data.data_version()
+    record["sections"] = _local.sections
+
+    sidebar.markdown("---")
+    sidebar.header("Debug")
+    sidebar.markdown("`%s`" % record["data_version"])
+    sidebar.table(pd.DataFrame(record["sections"]).set_index("section"))
+
+    directory = os.path.dirname(LOG_FILE)
+    with _log_lock:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1,333 @@
+"""Language-independent content of the dashboard.
+
+Every number, series and language-neutral chart shown by the app is built
+here once per data version and shared by all sessions; the Français and
+Wolof views (see i18n.py) only differ by the strings around them.
+"""
+import json
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+import clusters
+import comparison
+import data
+import fitting
+import gazetteer
+import geo
+import regions
+
+# Cases from which the compared curves are aligned
+COMPARISON_THRESHOLD = 1
+
+# Country names as written in Source/Voyage, with their ISO code and centroid
+COUNTRIES_FILE = "app/countries.csv"
+DESTINATION = "Sénégal"
+
+# Region name of the whole country in the growth fits
+NATIONAL = "Sénégal"
+
+# Inhabitants per rate unit of the choropleth
+RATE_PER = 100000
+
+# Size of the map, in pixels
+MAP_WIDTH = 700
+MAP_HEIGHT = 550
+
+# Years per bar of the age histogram
+AGE_BIN = 10
+
+
+def _headline(path):
+    rollup = data.rollup(path)
+    positif = rollup.totals['Positif']
+    negatif = rollup.totals['Negatif']
+    decede = rollup.totals['Décédé']
+    gueri = rollup.totals['Guéri']
+    return {
+        'malades': positif - gueri,
+        'deces': decede,
+        'gueris': gueri,
+        'pct_guerison': np.round(gueri / positif * 100, 1),
+        'croissance': np.round(rollup.growth_rate() * 100, 2),
+        'positifs': positif,
+        'negatifs': negatif,
+        'tests': positif + negatif,
+        'pct_positifs': np.round(positif / (positif + negatif) * 100, 1),
+    }
+
+
+def headline(path=data.DATA_FILE):
+    """'En bref' numbers."""
+    return data.cached("model.headline", lambda: _headline(path), path)
+
+
+def last_update(path=data.DATA_FILE):
+    """Date of the latest rows, as dd/mm/yyyy."""
+    return data.cached("model.last_update", lambda: data.rollup(path).last_date.strftime("%d/%m/%Y"), path)
+
+
+def _map_points(path):
+    # Unknown Villes get NaN coordinates, see `python app/gazetteer.py missing`
+    summary = data.city_summary(path)
+    return summary.join(gazetteer.locate(summary['Ville']))
+
+
+def map_points(path=data.DATA_FILE):
+    """Positive cases and coordinates per Ville."""
+    return data.cached("model.map_points", lambda: _map_points(path), path)
+
+
+def map_pyramid(path=data.DATA_FILE):
+    """Positive cases clustered per zoom level (see clusters.py)."""
+    return data.cached("model.map_pyramid", lambda: clusters.pyramid(map_points(path)), path)
+
+
+def view_bounds(zone=None):
+    """Extent of the map showing region `zone` (the whole country for None).
+
+    The region's box is padded and widened to the shape of the map, so that
+    degrees keep the same scale on both axes.
+    """
+    x0, y0, x1, y1 = regions.bounds(zone)
+    pad = 0.05 * max(x1 - x0, y1 - y0)
+    x0, y0, x1, y1 = x0 - pad, y0 - pad, x1 + pad, y1 + pad
+    width = max(x1 - x0, (y1 - y0) * MAP_WIDTH / MAP_HEIGHT)
+    height = width * MAP_HEIGHT / MAP_WIDTH
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2
+
+
+def map_view(zone=None, path=data.DATA_FILE):
+    """Clusters of the level matching the view of `zone`, inside it."""
+    name = "model.map_view.%s" % zone
+    return data.cached(name, lambda: clusters.view(map_pyramid(path), view_bounds(zone), MAP_WIDTH), path)
+
+
+def _region_cases(path):
+    points = map_points(path)
+    cases = points.groupby(regions.assign(points['longitude'], points['latitude']))['Positif'].sum()
+    table = regions.population().to_frame()
+    table['Positif'] = cases.reindex(table.index).fillna(0).astype(int)
+    table['rate'] = (table['Positif'] / table['Population'] * RATE_PER).round(2)
+    return table
+
+
+def region_cases(path=data.DATA_FILE):
+    """Positive cases and cases per RATE_PER inhabitants, per Region."""
+    return data.cached("model.region_cases", lambda: _region_cases(path), path)
+
+
+def _choropleth(path):
+    table = region_cases(path)
+    geojson, _, _ = regions.load()
+    features = []
+    for feature in geojson['features']:
+        row = table.loc[feature['properties']['Region']]
+        properties = dict(feature['properties'], Positif=int(row['Positif']), rate=float(row['rate']))
+        features.append(dict(feature, properties=properties))
+    return json.dumps(dict(geojson, features=features))
+
+
+def choropleth(path=data.DATA_FILE):
+    """GeoJSON string of the regions with their cases, ready for GeoJSONDataSource."""
+    return data.cached("model.choropleth", lambda: _choropleth(path), path)
+
+
+def map_figure(tooltips, regions_tooltips, zone=None, path=data.DATA_FILE):
+    """Bokeh map of the clustered cases over the regions' choropleth, showing
+    region `zone` or the whole country.
+
+    Built anew on every call: Bokeh models belong to one document at a time.
+    """
+    from bokeh.plotting import figure
+    from bokeh.models import GeoJSONDataSource, ColumnDataSource, HoverTool, LinearColorMapper
+    from bokeh.palettes import YlOrRd9
+
+    # Prebuilt, simplified boundary (see geo.py)
+    geosource = GeoJSONDataSource(geojson=geo.senegal_geojson())
+    regionsource = GeoJSONDataSource(geojson=choropleth(path))
+    # Only the clusters of this view, whatever the number of locations
+    pointsource = ColumnDataSource(map_view(zone, path))
+    x0, y0, x1, y1 = view_bounds(zone)
+
+    p = figure(plot_height=MAP_HEIGHT, plot_width=MAP_WIDTH, x_range=(x0, x1), y_range=(y0, y1),
+               tools=['pan', 'wheel_zoom'])
+    p.xgrid.grid_line_color = None
+    p.ygrid.grid_line_color = None
+    p.xaxis.visible = False
+    p.yaxis.visible = False
+    p.outline_line_color = None
+
+    p.patches('xs', 'ys', source=geosource, fill_color='#fff7bc',
+              line_color='black', line_width=0.35, fill_alpha=1)
+
+    # Regions shaded by cases per RATE_PER inhabitants
+    mapper = LinearColorMapper(palette=YlOrRd9[::-1], low=0)
+    shaded = p.patches('xs', 'ys', source=regionsource,
+                       fill_color={'field': 'rate', 'transform': mapper},
+                       line_color='black', line_width=0.25, fill_alpha=1)
+    points = p.circle('longitude', 'latitude', source=pointsource, size='size', fill_alpha=0.7)
+
+    p.add_tools(HoverTool(renderers=[shaded], tooltips=regions_tooltips))
+    p.add_tools(HoverTool(renderers=[points], tooltips=tooltips))
+    return p
+
+
+def _evolution_chart(path):
+    return alt.Chart(data.evolution(path).reset_index()).transform_fold(
+        ['Positif', 'Actifs'],
+    ).mark_line(size=5, point=True).encode(
+        x='Date:T',
+        y='value:Q',
+        color='key:N',
+        tooltip="value:Q"
+    ).properties(height=400, width=700)
+
+
+def evolution_chart(path=data.DATA_FILE):
+    return data.cached("model.evolution_chart", lambda: _evolution_chart(path), path)
+
+
+def _growth_fits(path):
+    series = {NATIONAL: data.evolution(path)['Positif']}
+    for ville, values in data.ville_series(path).items():
+        series[str(ville)] = values
+    fits = fitting.fit(series)
+
+    rows = []
+    for region, results in fits.items():
+        row = {'region': region}
+        for name, result in results.items():
+            row[name + '_doubling_time'] = result and result['doubling_time']
+            row[name + '_projection'] = result and result['projection']
+        rows.append(row)
+    table = pd.DataFrame(rows).set_index('region').round(1)
+    return table
+
+
+def growth_fits(path=data.DATA_FILE):
+    """Doubling time and projection of the logistic and exponential fits, per region."""
+    return data.cached("model.growth_fits", lambda: _growth_fits(path), path)
+
+
+def _contamination(path):
+    totals, df_int = data.contamination(path)
+    chart = alt.Chart(df_int).transform_fold(
+        list(totals.index),
+    ).mark_line(size=5).encode(
+        x='Date:T',
+        y='value:Q',
+        color='key:N'
+    ).properties(height=500, width=700)
+    return totals, chart
+
+
+def contamination(path=data.DATA_FILE):
+    """Total cases per Facteur, and the chart of their cumulative counts."""
+    return data.cached("model.contamination", lambda: _contamination(path), path)
+
+
+def _origins(path):
+    counts = data.load_cases(path)['Source/Voyage'].dropna().astype(str).value_counts()
+    countries = pd.read_csv(COUNTRIES_FILE)
+    countries.index = gazetteer.normalize(countries['Pays']).values
+    countries = countries[~countries.index.duplicated()]
+    origins = countries.reindex(gazetteer.normalize(counts.index).values)
+    origins['Source/Voyage'] = counts.index
+    origins['count'] = counts.values
+    # Origins missing from countries.csv are left out of the globe
+    return origins.dropna(subset=['iso_alpha']), countries.loc[gazetteer.normalize([DESTINATION])[0]]
+
+
+def _origin_globe(path):
+    import plotly.graph_objects as go
+
+    origins, senegal = _origins(path)
+    widest = origins['count'].max() if len(origins) else 1
+
+    fig = go.Figure()
+    for _, origin in origins.iterrows():
+        fig.add_trace(go.Scattergeo(
+            lon=[origin['Longitude'], senegal['Longitude']],
+            lat=[origin['Latitude'], senegal['Latitude']],
+            mode='lines',
+            line=dict(width=1 + 9 * origin['count'] / widest),
+            name=origin['Source/Voyage'],
+            hoverinfo='text',
+            text='%s: %d' % (origin['Source/Voyage'], origin['count']),
+        ))
+    fig.update_geos(projection_type="orthographic", showcountries=True,
+                    projection_rotation=dict(lon=senegal['Longitude'], lat=senegal['Latitude']))
+    return fig
+
+
+def origin_globe(path=data.DATA_FILE):
+    return data.cached("model.origin_globe", lambda: _origin_globe(path), path)
+
+
+def _counts(path, column):
+    counts = data.load_cases(path)[column].dropna().astype(str).value_counts().sort_index()
+    return pd.DataFrame({column: counts.index, 'count': counts.values})
+
+
+def _age_counts(path):
+    ages = data.load_cases(path)['Age'].dropna()
+    counts = (ages // AGE_BIN * AGE_BIN).astype(int).value_counts().sort_index()
+    return pd.DataFrame({'Age': counts.index, 'Age_end': counts.index + AGE_BIN, 'count': counts.values})
+
+
+def _bar_chart(path, column, title, axis):
+    if column == 'Age':
+        chart = alt.Chart(_age_counts(path)).mark_bar().encode(
+            x=alt.X('Age:Q', bin='binned', title='Age'),
+            x2='Age_end:Q',
+        )
+    else:
+        chart = alt.Chart(_counts(path, column)).mark_bar().encode(
+            x='%s:N' % column,
+        )
+    return chart.encode(
+        y=alt.Y('count:Q', title=axis)
+    ).properties(title=title, height=300, width=700)
+
+
+def bar_chart(column, title, axis, path=data.DATA_FILE):
+    """Number of patients per `column` value (per age bin for 'Age').
+
+    Counts are computed here, so the chart only carries one row per bar.
+    """
+    name = "model.bar_chart.%s.%s.%s" % (column, title, axis)
+    return data.cached(name, lambda: _bar_chart(path, column, title, axis), path)
+
+
+def _population(path):
+    counts = data.population_counts(path)
+    age_sum, ages = counts['Age']
+    days_sum, stays = counts['Temps Hospitalisation (j)']
+    return {
+        'age_mean': age_sum / ages if ages else np.nan,
+        'sexes': counts['sexes'].to_frame().transpose(),
+        'residents': counts['residents'],
+        'hospitalisation_mean': days_sum / stays if stays else np.nan,
+    }
+
+
+def population(path=data.DATA_FILE):
+    return data.cached("model.population", lambda: _population(path), path)
+
+
+def comparison_chart(title, labels, path=data.DATA_FILE):
+    """Senegal and the bundled countries, aligned on their first case."""
+    aligned, _ = comparison.compare(COMPARISON_THRESHOLD, path)
+    name = "model.comparison_chart.%s.%s" % (title, sorted(labels.items()))
+    return data.cached(name, lambda: comparison.chart(aligned, labels, title), path)
+
+
+def comparison_lags(path=data.DATA_FILE):
+    """Days by which each bundled country's curve precedes Senegal's, for
+    the countries whose lag could be measured."""
+    _, lags = comparison.compare(COMPARISON_THRESHOLD, path)
+    return lags.dropna().astype(int)
+
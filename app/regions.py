@@ -0,0 +1,74 @@
+"""Administrative regions (admin-1) of Senegal.
+
+Boundaries and populations of the 14 regions are bundled in
+senegal_regions.geojson. Points are assigned to regions with one bulk
+query on an STRtree of the boundaries, which keeps the assignment cheap
+when records carry finer locations than the Ville.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+import data
+
+REGIONS_FILE = 'app/senegal_regions.geojson'
+
+# Degrees; points just off the simplified coastline still get the nearest
+# region, points farther away (e.g. wrong coordinates) get none
+NEAREST = 0.2
+
+
+def _load(path):
+    import shapely
+    from shapely.geometry import shape
+
+    with open(path, encoding="utf-8") as f:
+        geojson = json.load(f)
+    properties = pd.DataFrame([feature['properties'] for feature in geojson['features']])
+    geometries = [shape(feature['geometry']) for feature in geojson['features']]
+    return geojson, properties, shapely.STRtree(geometries)
+
+
+def load(path=REGIONS_FILE):
+    """The GeoJSON, the region properties and the STRtree of their boundaries."""
+    return data.cached("regions", lambda: _load(path), path)
+
+
+def population(path=REGIONS_FILE):
+    """Inhabitants per Region."""
+    _, properties, _ = load(path)
+    return properties.set_index('Region')['Population']
+
+
+def bounds(region=None, path=REGIONS_FILE):
+    """(x0, y0, x1, y1) of `region`, or of the whole country."""
+    import shapely
+
+    _, properties, tree = load(path)
+    boxes = shapely.bounds(tree.geometries)
+    if region is not None:
+        boxes = boxes[(properties['Region'] == region).values]
+    return boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max()
+
+
+def assign(longitude, latitude, path=REGIONS_FILE):
+    """Region of each point (None when unknown), aligned on the inputs."""
+    import shapely
+
+    _, properties, tree = load(path)
+    longitude = np.asarray(longitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+    known = np.flatnonzero(~(np.isnan(longitude) | np.isnan(latitude)))
+    points = shapely.points(longitude[known], latitude[known])
+
+    names = properties['Region'].values
+    regions = np.full(len(longitude), None, dtype=object)
+    point, region = tree.query(points, predicate='within')
+    regions[known[point]] = names[region]
+
+    outside = np.setdiff1d(np.arange(len(points)), point)
+    if len(outside):
+        point, region = tree.query_nearest(points[outside], max_distance=NEAREST, all_matches=False)
+        regions[known[outside[point]]] = names[region]
+    return regions
@@ -0,0 +1,115 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Positif', 'Negatif', 'Décédé', 'Guéri']
+
+
+class DailyRollup:
+    """Append-only per-day counts and cumulative totals of the case rows.
+
+    `append` costs time proportional to the appended rows (plus the days
+    following the earliest appended date, when rows arrive late); the latest
+    totals and the smoothed growth rate are read in constant time.
+    """
+
+    def __init__(self, columns=COLUMNS):
+        self.columns = list(columns)
+        self._dates = []
+        self._position = {}
+        self._daily = np.zeros((16, len(self.columns)))
+        self._cumul = np.zeros((16, len(self.columns)))
+        # Columns that only ever received integers keep an integer dtype
+        self._integer = dict.fromkeys(self.columns, True)
+
+    def __len__(self):
+        return len(self._dates)
+
+    def copy(self):
+        """Independent copy, in time proportional to the number of days."""
+        other = copy.copy(self)
+        other._dates = list(self._dates)
+        other._position = dict(self._position)
+        other._daily = self._daily.copy()
+        other._cumul = self._cumul.copy()
+        other._integer = dict(self._integer)
+        return other
+
+    def _grow(self):
+        size = len(self._daily) * 2
+        for name in ('_daily', '_cumul'):
+            old = getattr(self, name)
+            new = np.zeros((size, len(self.columns)))
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def append(self, rows):
+        """Add case rows (a frame with Date and the rollup columns)."""
+        days = rows[['Date'] + self.columns].groupby("Date").sum()
+        for col in self.columns:
+            self._integer[col] &= pd.api.types.is_integer_dtype(rows[col])
+        n = len(self._dates)
+        first = n
+        for date, counts in zip(days.index, days.values.astype(float)):
+            i = self._position.get(date)
+            if i is None and (n == 0 or date > self._dates[n - 1]):
+                if n == len(self._daily):
+                    self._grow()
+                i = self._position[date] = n
+                self._dates.append(date)
+                n += 1
+            elif i is None:
+                # Late day in the middle of the history: rebuild the index
+                self._insert(date)
+                n += 1
+                i = self._position[date]
+            self._daily[i] += counts
+            first = min(first, i)
+        if first < n:
+            self._cumul[first:n] = np.cumsum(self._daily[first:n], axis=0)
+            if first:
+                self._cumul[first:n] += self._cumul[first - 1]
+        return self
+
+    def _insert(self, date):
+        i = int(np.searchsorted(np.array(self._dates, dtype='datetime64[ns]'), np.datetime64(date, 'ns')))
+        if len(self._dates) == len(self._daily):
+            self._grow()
+        n = len(self._dates)
+        self._daily[i + 1:n + 1] = self._daily[i:n].copy()
+        self._daily[i] = 0
+        self._dates.insert(i, date)
+        self._position = {d: j for j, d in enumerate(self._dates)}
+
+    @property
+    def last_date(self):
+        return self._dates[-1] if self._dates else None
+
+    @property
+    def totals(self):
+        """Latest cumulative totals, by column."""
+        if not self._dates:
+            return dict.fromkeys(self.columns, 0)
+        last = self._cumul[len(self._dates) - 1]
+        return {col: int(v) if self._integer[col] else v for col, v in zip(self.columns, last)}
+
+    def growth_rate(self, column='Positif', periods=2):
+        """Daily growth rate of `column` smoothed over the last `periods` days."""
+        n = len(self._dates)
+        if n <= periods:
+            return np.nan
+        j = self.columns.index(column)
+        previous = self._cumul[n - 1 - periods, j]
+        if previous == 0:
+            return np.nan
+        return (self._cumul[n - 1, j] / previous) ** (1 / periods) - 1
+
+    def frame(self):
+        """Cumulative totals per day, like groupby("Date").sum().cumsum()."""
+        n = len(self._dates)
+        evol_cases = pd.DataFrame(self._cumul[:n], columns=self.columns,
+                                  index=pd.DatetimeIndex(self._dates, name='Date'))
+        integer = [col for col in self.columns if self._integer[col]]
+        evol_cases[integer] = evol_cases[integer].astype(np.int64)
+        return evol_cases
@@ -0,0 +1,189 @@
+"""Expected columns and values of the case file, checked vectorized.
+
+Every check is one boolean column over all rows. A row failing a check on
+a column of REQUIRED (the date and the test outcomes) is dropped; for the
+other checks only the faulty cells are cleared, so that a misspelt
+Resident Senegal does not remove a positive case from the totals. Both
+kinds of rows are listed in the report and kept aside in the quarantine
+file (see storage.py). A value of Facteur not seen before is only listed
+in the report, as a notice: it is a new category of the contamination
+chart, not an error.
+
+    python app/schema.py [COVID_Senegal.csv]     # print the report as JSON
+"""
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = "%d.%m.%y"
+
+COLUMNS = ['Date', 'Positif', 'Negatif', 'Age', 'Homme', 'Femme', 'Décédé', 'Guéri', 'Nationalité',
+           'Resident Senegal', 'Ville', 'Facteur', 'Source/Voyage', 'Hopital', 'Temps Hospitalisation (j)']
+
+# Inclusive bounds of the numeric columns, which may be left empty
+RANGES = {
+    'Positif': (0, 1),
+    'Negatif': (0, 1),
+    'Age': (0, 120),
+    'Homme': (0, 1),
+    'Femme': (0, 1),
+    'Décédé': (0, 1),
+    'Guéri': (0, 1),
+    'Temps Hospitalisation (j)': (0, 365),
+}
+
+ALLOWED = {
+    'Resident Senegal': ['Oui', 'Non'],
+}
+
+# Values seen so far: others are reported, and kept
+KNOWN = {
+    'Facteur': ['Importé', 'Contact', 'Communauté'],
+}
+
+REQUIRED = ['Date', 'Positif', 'Negatif', 'Décédé', 'Guéri']
+
+# Line numbers listed per check in the report
+REPORT_LINES = 20
+
+
+def _distinct(values, parse):
+    # The case file repeats every date and most counts on many rows: each
+    # distinct string is parsed once, the missing value (code -1) gets NaN
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    parsed = parse(pd.Series(uniques, dtype=object))
+    filled = np.append(parsed, np.array([np.nan]).astype(parsed.dtype))[codes]
+    return pd.Series(filled, index=getattr(values, 'index', None))
+
+
+def _new_value(col):
+    return '%s: new value (known: %s)' % (col, ", ".join(KNOWN[col]))
+
+
+# Checks only listed in the report: the cells are kept, the rows accepted
+NOTICES = [_new_value(col) for col in KNOWN]
+
+
+def errors(failed):
+    """The checks of `failed` (see check) that clear cells or drop rows."""
+    return failed.drop(columns=NOTICES, errors='ignore')
+
+
+def parse_dates(values):
+    """Dates written as DATE_FORMAT, NaT otherwise."""
+    return _distinct(values, lambda x: pd.to_datetime(x, format=DATE_FORMAT, errors='coerce').values.astype('datetime64[ns]'))
+
+
+def parse_numbers(values):
+    """Numbers as float, NaN for empty or unreadable cells."""
+    return _distinct(values, lambda x: pd.to_numeric(x, errors='coerce').values.astype(float))
+
+
+def parse(rows):
+    """Date and numeric columns of `rows` (text), parsed."""
+    values = {col: parse_numbers(rows[col]) for col in RANGES}
+    values['Date'] = parse_dates(rows['Date'])
+    return values
+
+
+def missing_columns(columns):
+    return [col for col in COLUMNS if col not in set(columns)]
+
+
+def header(columns):
+    """Column names without the BOMs and spaces left by concatenated exports."""
+    return pd.Index(columns).str.replace('\ufeff', '').str.strip()
+
+
+def check(rows, values=None):
+    """Failed checks of each row, `rows` being read as text.
+
+    Returns a boolean frame with one column per check, and the columns each
+    check is about, by check name. `values` are the parsed rows, if known.
+    """
+    values = values if values is not None else parse(rows)
+    failed = {}
+    about = {}
+
+    def add(name, columns, mask):
+        failed[name] = mask
+        about[name] = columns
+
+    add('Date: %s' % DATE_FORMAT, ['Date'], values['Date'].isna())
+
+    for col, (low, high) in RANGES.items():
+        add('%s: number' % col, [col], (rows[col] != '') & values[col].isna())
+        add('%s: %g to %g' % (col, low, high), [col], (values[col] < low) | (values[col] > high))
+    for col in ('Positif', 'Negatif'):
+        add('%s: missing' % col, [col], rows[col] == '')
+
+    outcomes = values['Positif'] + values['Negatif']
+    add('Positif + Negatif: 1', ['Positif', 'Negatif'], outcomes.notna() & (outcomes != 1))
+    given = values['Homme'].notna() | values['Femme'].notna()
+    sexes = values['Homme'].fillna(0) + values['Femme'].fillna(0)
+    add('Homme + Femme: 1', ['Homme', 'Femme'], given & (sexes != 1))
+
+    for col, allowed in ALLOWED.items():
+        add('%s: one of %s' % (col, ", ".join(allowed)), [col], (rows[col] != '') & ~rows[col].isin(allowed))
+    for col, known in KNOWN.items():
+        add(_new_value(col), [col], (rows[col] != '') & ~rows[col].isin(known))
+    return pd.DataFrame(failed, index=rows.index), about
+
+
+def clean(rows):
+    """Apply the checks to `rows` (text).
+
+    Returns the rows to keep, parsed (dates, float numbers, NaN for empty
+    or cleared cells), the quarantined rows as read with the names of their
+    failed checks, and the failed checks frame.
+    """
+    values = parse(rows)
+    failed, about = check(rows, values)
+    kept = rows.replace('', np.nan).assign(**values)
+    drop = pd.Series(False, index=rows.index)
+    for name, columns in about.items():
+        mask = failed[name]
+        if not mask.any() or name in NOTICES:
+            continue
+        if set(columns) & set(REQUIRED):
+            drop |= mask
+        else:
+            kept.loc[mask, columns] = np.nan
+
+    bad = errors(failed).any(axis=1)
+    quarantine = rows[bad].copy()
+    names = np.array(errors(failed).columns)
+    quarantine['Checks'] = [" | ".join(names[row]) for row in errors(failed)[bad].values]
+    return kept[~drop], quarantine, failed
+
+
+def report(failed, source, dropped):
+    """Machine-readable summary of the failed checks of a whole file."""
+    # Line 1 is the header
+    def listed(checks):
+        return [
+            {'check': name, 'count': int(mask.sum()), 'lines': [int(i) + 2 for i in mask.index[mask][:REPORT_LINES]]}
+            for name, mask in checks.items() if mask.any()
+        ]
+
+    return {
+        'source': source,
+        'rows': len(failed),
+        'dropped': int(dropped),
+        'cleared': int(errors(failed).any(axis=1).sum() - dropped),
+        'checks': listed(errors(failed)),
+        'notices': listed(failed[[name for name in NOTICES if name in failed]]),
+    }
+
+
+if __name__ == "__main__":
+    import data
+    import storage
+
+    path = sys.argv[1] if len(sys.argv) > 1 else data.DATA_FILE
+    _, _, summary = storage.read_checked(path)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    sys.exit(1 if summary['checks'] else 0)
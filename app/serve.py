@@ -0,0 +1,28 @@
+"""Start command of the dashboard: warm-up first, then the Streamlit server.
+
+`streamlit run app/app.py` only warms the cache up once a session runs the
+script, so without visitors READY_FILE never reports ready. Started from
+here, the warm-up begins with the server process, before the first
+request, and `python app/warmup.py check` can serve as the startup probe:
+
+    python app/serve.py [streamlit options]     # e.g. --server.port $PORT
+
+app.py imports the same warmup module in the same process, so its own
+warmup.start() finds the watcher already running.
+"""
+import os
+import sys
+
+import warmup
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+if __name__ == "__main__":
+    try:
+        from streamlit.web import cli
+    except ImportError:
+        from streamlit import cli
+    warmup.start()
+    sys.argv = ["streamlit", "run", APP] + sys.argv[1:]
+    sys.exit(cli.main())
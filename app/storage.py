@@ -0,0 +1,223 @@
+"""Typed columnar copy of COVID_Senegal.csv.
+
+The CSV is converted once to an uncompressed Arrow IPC file next to it
+(COVID_Senegal.arrow), with categorical string columns, int32 counts and
+datetime dates. Every worker process memory-maps that file read-only and
+gets a DataFrame whose columns are views of the mapped pages, so the data
+is held once by the OS instead of once per worker. For that no column may
+need a conversion: missing counts are stored as NaN rather than Arrow
+nulls, and categorical columns as their pandas codes (-1 when missing)
+with the categories in the file metadata. Without pyarrow the CSV is read
+directly.
+Rows are checked while read (see schema.py); the report and the rejected
+rows are written next to the CSV (COVID_Senegal.report.json and
+COVID_Senegal.quarantine.csv).
+
+    python app/storage.py [COVID_Senegal.csv]
+"""
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+import schema
+
+CATEGORIES = ['Nationalité', 'Resident Senegal', 'Ville', 'Facteur', 'Source/Voyage', 'Hopital']
+COUNTS = ['Positif', 'Negatif', 'Age', 'Homme', 'Femme', 'Décédé', 'Guéri', 'Temps Hospitalisation (j)']
+
+SOURCE_KEY = b'covid_senegal_source'
+CATEGORIES_KEY = b'covid_senegal_categories'
+
+# Rows parsed and checked at a time
+CHUNK_ROWS = 200000
+
+# pandas releases whose block manager _shared_frame was checked against;
+# other releases get a plain copy of the columns
+SHARED_PANDAS = ('1.0', '3.0')
+
+
+def arrow_path(path):
+    return os.path.splitext(path)[0] + ".arrow"
+
+
+def typed(df):
+    """Categorical strings, int32 counts, float32 where values are missing."""
+    for col in CATEGORIES:
+        if col in df:
+            df[col] = df[col].astype('category')
+    for col in COUNTS:
+        if col not in df:
+            continue
+        if df[col].isnull().any():
+            df[col] = df[col].astype(np.float32)
+        else:
+            df[col] = df[col].astype(np.int32)
+    return df
+
+
+def report_path(path):
+    return os.path.splitext(path)[0] + ".report.json"
+
+
+def quarantine_path(path):
+    return os.path.splitext(path)[0] + ".quarantine.csv"
+
+
+def read_checked(source):
+    """Checked case-level frame of `source`, the quarantined rows and the report.
+
+    The file is read and checked CHUNK_ROWS rows at a time (see schema.py).
+    """
+    frames, quarantined, failed = [], [], []
+    dropped = 0
+    chunks = pd.read_csv(source, sep=";", encoding="utf-8-sig", dtype=str,
+                         keep_default_na=False, chunksize=CHUNK_ROWS)
+    for chunk in chunks:
+        chunk.columns = schema.header(chunk.columns)
+        missing = schema.missing_columns(chunk.columns)
+        if missing:
+            raise ValueError("%s: missing columns %s" % (source, ", ".join(missing)))
+        kept, bad, checks = schema.clean(chunk)
+        dropped += len(chunk) - len(kept)
+        frames.append(kept)
+        quarantined.append(bad)
+        failed.append(checks)
+
+    df = typed(pd.concat(frames, ignore_index=True))
+    summary = schema.report(pd.concat(failed), source if isinstance(source, str) else None, dropped)
+    return df, pd.concat(quarantined), summary
+
+
+def _write_report(path, quarantine, summary):
+    try:
+        quarantine.to_csv(quarantine_path(path), sep=";", index=False)
+        with open(report_path(path), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+    except OSError:
+        pass
+
+
+def read_csv(path, report=False):
+    """Checked case-level frame; with `report`, the report and quarantine files are written next to `path`."""
+    df, quarantine, summary = read_checked(path)
+    if report:
+        _write_report(path, quarantine, summary)
+    return df
+
+
+def read_csv_tail(path, offset, end=None):
+    """Rows of `path` from byte `offset` to `end`, both ends of lines."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        rows = f.read() if end is None else f.read(end - offset)
+    return read_csv(io.BytesIO(header + rows))
+
+
+def _table(df, source):
+    # Plain numpy-backed columns only, so that reading them back needs no
+    # conversion: categories as their codes (-1 when missing), their values
+    # in the metadata, and NaN kept as a float instead of an Arrow null
+    categories = {}
+    arrays = []
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORIES:
+            categories[col] = [str(c) for c in values.cat.categories]
+            values = values.cat.codes
+        arrays.append(pa.array(values.values, from_pandas=False))
+    metadata = {SOURCE_KEY: source.encode(), CATEGORIES_KEY: json.dumps(categories).encode()}
+    return pa.Table.from_arrays(arrays, names=list(df.columns), metadata=metadata)
+
+
+def convert(path, source, target=None):
+    """Write the typed Arrow copy of `path`, tagged with its content hash
+    `source`, and return the frame mapped from it."""
+    target = target or arrow_path(path)
+    table = _table(read_csv(path, report=True), source)
+
+    # Write aside then rename, so that readers never map a partial file
+    tmp = "%s.%d.tmp" % (target, os.getpid())
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, target)
+    # The converting process shares the mapped copy like the others
+    return _read_arrow(target, source)
+
+
+def _copied_frame(table, categories):
+    df = table.to_pandas()
+    for col, values in categories.items():
+        df[col] = pd.Categorical.from_codes(df[col].values, values)
+    return df
+
+
+def _shared_frame(table, categories):
+    """Frame whose columns are views of the memory-mapped `table`.
+
+    DataFrame methods copy the arrays they are given, and pandas merges
+    columns of the same type into 2D blocks on the first selection of
+    several columns: the categories are inserted and the blocks kept apart
+    through the block manager instead. That relies on pandas internals, so
+    only on the releases of SHARED_PANDAS.
+    """
+    if '.'.join(pd.__version__.split('.')[:2]) not in SHARED_PANDAS:
+        return _copied_frame(table, categories)
+    # split_blocks: one block per column, viewing the mapped buffers
+    df = table.to_pandas(split_blocks=True)
+    columns = list(df.columns)
+    codes = {col: df[col].values for col in categories}
+    for col in categories:
+        del df[col]
+    manager = df._mgr if hasattr(df, '_mgr') else df._data
+    for position, col in enumerate(columns):
+        if col in categories:
+            manager.insert(position, col, pd.Categorical.from_codes(codes[col], categories[col]))
+    manager._is_consolidated = manager._known_consolidated = True
+    if hasattr(df, '_clear_item_cache'):
+        df._clear_item_cache()
+    return df
+
+
+def _read_arrow(target, source):
+    if not os.path.exists(target):
+        return None
+    reader = pa.ipc.open_file(pa.memory_map(target, 'r'))
+    metadata = reader.schema.metadata or {}
+    if metadata.get(SOURCE_KEY) != source.encode() or CATEGORIES_KEY not in metadata:
+        return None
+    return _shared_frame(reader.read_all(), json.loads(metadata[CATEGORIES_KEY]))
+
+
+def load(path, source):
+    """Case-level frame of `path`, from its Arrow copy when it is up to date.
+
+    `source` is the content hash of `path`; a stale or missing Arrow copy is
+    rebuilt from the CSV when the directory is writable.
+    """
+    if pa is None:
+        return read_csv(path, report=True)
+    df = _read_arrow(arrow_path(path), source)
+    if df is not None:
+        return df
+    try:
+        return convert(path, source)
+    except OSError:
+        return read_csv(path, report=True)
+
+
+if __name__ == "__main__":
+    import data
+
+    csv = sys.argv[1] if len(sys.argv) > 1 else data.DATA_FILE
+    convert(csv, data.content_hash(csv))
+    print("Wrote %s" % arrow_path(csv))
@@ -0,0 +1,176 @@
+"""Warm-up of the shared cache, so that no visitor meets a cold path.
+
+Once the case file is parsed, the artifacts of the dashboard (aggregates,
+boundaries, Altair specs, Plotly globe, growth fits) are independent: they
+are built concurrently on a thread pool, as soon as serve.py starts the
+server process and again whenever the case file changes. Threads rather
+than processes, because the results must land in this process's cache
+(see data.py) and the heavy parts release the GIL: CSV parsing, numpy, and
+the growth fits, which have their own process pool.
+
+The state of the warm-up is written to READY_FILE, for health checks.
+Once a warm-up has completed, the process stays "ready": while a new
+version of the data warms up, or if that warm-up failed, it keeps serving
+and READY_FILE reports it under "rewarm", so that replicas do not all
+leave the rotation when the data changes:
+
+    python app/warmup.py            # warm up a fresh process, print the timings
+    python app/warmup.py check      # exit 0 once the app is warm for the current data
+"""
+import concurrent.futures
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import comparison
+import data
+import gazetteer
+import geo
+import model
+import regions
+from i18n import TEXT
+
+READY_FILE = os.environ.get("COVID_READY_FILE", "ready.json")
+
+# Threads of the pool; None is the executor's default, a few more than the CPUs
+WORKERS = None
+
+# Seconds between two checks of the case file for a new version
+INTERVAL = 5
+
+ready = threading.Event()
+status = {"state": "cold"}
+_state = {"thread": None, "version": None}
+_start_lock = threading.Lock()
+
+
+def tasks(path=data.DATA_FILE):
+    """Everything the sections read from the cache, by name, longest first."""
+    jobs = {
+        "cases": functools.partial(data.load_cases, path),
+        "growth_fits": functools.partial(model.growth_fits, path),
+        "geojson": geo.senegal_geojson,
+        "regions": regions.load,
+        "gazetteer": gazetteer.load,
+        "series": comparison.load,
+        "headline": functools.partial(model.headline, path),
+        "last_update": functools.partial(model.last_update, path),
+        "choropleth": functools.partial(model.choropleth, path),
+        "map_view": functools.partial(model.map_view, None, path),
+        "evolution_chart": functools.partial(model.evolution_chart, path),
+        "contamination": functools.partial(model.contamination, path),
+        "origin_globe": functools.partial(model.origin_globe, path),
+        "population": functools.partial(model.population, path),
+    }
+    # Charts carrying the strings of a language
+    for langue, t in TEXT.items():
+        for column, key in (('Source/Voyage', "sources_chart"), ('Age', "age_chart"), ('Ville', "cities_chart")):
+            jobs["%s/%s" % (langue, key)] = functools.partial(model.bar_chart, column, *t[key], path=path)
+        if "netherlands" in t:
+            jobs["%s/comparison" % langue] = functools.partial(
+                model.comparison_chart, t["netherlands_chart"], t["netherlands_labels"], path)
+    return jobs
+
+
+def _write(state):
+    tmp = "%s.%d.tmp" % (READY_FILE, os.getpid())
+    try:
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp, READY_FILE)
+    except OSError:
+        pass
+
+
+def _timed(job):
+    start = time.perf_counter()
+    job()
+    return round(time.perf_counter() - start, 3)
+
+
+def warm(path=data.DATA_FILE, workers=WORKERS, report=True):
+    """Build every task for the current version of `path`; returns the status.
+
+    With `report`, the status is also written to READY_FILE.
+    """
+    version = data.data_version(path)
+    _state["version"] = version
+    warmed = ready.is_set()
+    if warmed:
+        status["rewarm"] = {"version": version, "state": "warming"}
+    else:
+        status.clear()
+        status.update(state="warming", version=version)
+    if report:
+        _write(status)
+
+    start = time.perf_counter()
+    seconds, errors = {}, {}
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        futures = {pool.submit(_timed, job): name for name, job in tasks(path).items()}
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                seconds[name] = future.result()
+            except Exception as e:
+                errors[name] = "%s: %s" % (type(e).__name__, e)
+
+    result = {"seconds": round(time.perf_counter() - start, 3), "tasks": seconds, "errors": errors}
+    if errors and warmed:
+        # Still ready with the values of the last complete warm-up
+        status["rewarm"] = dict(result, version=version, state="failed")
+    elif errors:
+        status.update(result, state="failed")
+    else:
+        status.pop("rewarm", None)
+        status.update(result, state="ready", version=version)
+        ready.set()
+    if report:
+        _write(status)
+    return status
+
+
+def _watch(path, interval):
+    while True:
+        try:
+            if data.data_version(path) != _state["version"]:
+                warm(path)
+        except OSError as e:
+            print("warmup: %s" % e, file=sys.stderr)
+        time.sleep(interval)
+
+
+def start(path=data.DATA_FILE, interval=INTERVAL):
+    """Warm up in the background now and after every change of `path`, once per process."""
+    with _start_lock:
+        if _state["thread"] is None:
+            # Not ready until this process has warmed up, whatever an earlier one wrote
+            _write(status)
+            _state["thread"] = threading.Thread(target=_watch, args=(path, interval), daemon=True)
+            _state["thread"].start()
+
+
+def check():
+    """Whether READY_FILE reports a complete warm-up, of the current data or,
+    while it is being warmed up, of an earlier version."""
+    try:
+        with open(READY_FILE) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return state.get("state") == "ready"
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["check"]:
+        sys.exit(0 if check() else 1)
+    # A fresh process says nothing about the app's readiness
+    result = warm(report=False)
+    for name, seconds in sorted(result["tasks"].items(), key=lambda item: -item[1]):
+        print("%-32s %7.3fs" % (name, seconds))
+    for name, error in result["errors"].items():
+        print("%-32s %s" % (name, error))
+    print("%-32s %7.3fs" % (result["state"], result["seconds"]))
@@ -0,0 +1,123 @@
+"""Synthetic case files with the layout of COVID_Senegal.csv.
+
+    python bench/generate.py 1000000 bench/data/cases_1M.csv [--days 365] [--seed 0]
+
+Rows are written in chunks, so files of 10M rows and more fit in memory.
+Value frequencies follow the real file: most rows are negative tests
+without any detail, and patient details are often missing.
+"""
+import argparse
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Date', 'Positif', 'Negatif', 'Age', 'Homme', 'Femme', 'Décédé', 'Guéri', 'Nationalité',
+           'Resident Senegal', 'Ville', 'Facteur', 'Source/Voyage', 'Hopital', 'Temps Hospitalisation (j)']
+
+START = datetime.date(2020, 3, 2)
+POSITIVE_RATE = 0.11
+
+VILLES = ['Dakar', 'Touba', 'Thies', 'Saint Louis', 'Diourbel', 'Ziguinchor', 'Nianing', 'Mbour',
+          'Kaolack', 'Tambacounda', 'Kolda', 'Louga', 'Fatick', 'Matam', 'Kaffrine', 'Kedougou', 'Sedhiou']
+VILLE_WEIGHTS = [40, 12, 4, 3, 3, 2, 1, 3, 2, 1, 1, 1, 1, 1, 1, 1, 1]
+FACTEURS = ['Contact', 'Importé', 'Communauté']
+FACTEUR_WEIGHTS = [125, 86, 12]
+SOURCES = ['Italie', 'France', 'Espagne', 'Angleterre', 'Belgique', 'Gambie', 'Mali']
+SOURCE_WEIGHTS = [21, 6, 3, 1, 1, 1, 1]
+NATIONALITES = ['Senegal', 'France', 'Gambie', 'Angleterre', 'Espagne']
+NATIONALITE_WEIGHTS = [20, 5, 1, 1, 1]
+HOPITAUX = ['FANN', 'Darou Marnane', 'Principal', 'Le Dantec']
+
+# Share of positive cases for which each detail is known
+KNOWN = {
+    'Age': 0.3,
+    'Sexe': 0.4,
+    'Ville': 0.5,
+    'Facteur': 0.95,
+    'Nationalité': 0.2,
+    'Hopital': 0.2,
+    'Temps Hospitalisation (j)': 0.15,
+    'Guéri': 0.4,
+    'Décédé': 0.1,
+}
+
+
+def _choice(rng, values, weights, size):
+    p = np.asarray(weights, dtype=float)
+    return rng.choice(np.asarray(values, dtype=object), size=size, p=p / p.sum())
+
+
+def _known(rng, column, size):
+    return rng.random(size) < KNOWN[column]
+
+
+def chunk(rng, size, days):
+    """`size` synthetic rows, dated over `days` days from START."""
+    # Later days get more rows, as the epidemic grows
+    offsets = np.sort((days * np.sqrt(rng.random(size))).astype(int))
+    # Format each day once
+    days_labels = (pd.to_datetime(START) + pd.to_timedelta(np.arange(days + 1), unit='D')).strftime('%d.%m.%y')
+    positive = rng.random(size) < POSITIVE_RATE
+    n = int(positive.sum())
+
+    details = {}
+    details['Age'] = np.where(_known(rng, 'Age', n), rng.integers(1, 95, n), np.nan)
+    sex = rng.random(n) < 0.6
+    known_sex = _known(rng, 'Sexe', n)
+    details['Homme'] = np.where(known_sex, sex, np.nan)
+    details['Femme'] = np.where(known_sex, ~sex, np.nan)
+    details['Guéri'] = np.where(_known(rng, 'Guéri', n), 1, np.nan)
+    details['Décédé'] = np.where(_known(rng, 'Décédé', n), rng.random(n) < 0.05, np.nan)
+    nationalite = _choice(rng, NATIONALITES, NATIONALITE_WEIGHTS, n)
+    known_nationalite = _known(rng, 'Nationalité', n)
+    details['Nationalité'] = np.where(known_nationalite, nationalite, None)
+    details['Resident Senegal'] = np.where(known_nationalite,
+                                           np.where(nationalite == 'Senegal', 'Oui', 'Non'), None)
+    details['Ville'] = np.where(_known(rng, 'Ville', n), _choice(rng, VILLES, VILLE_WEIGHTS, n), None)
+    facteur = _choice(rng, FACTEURS, FACTEUR_WEIGHTS, n)
+    details['Facteur'] = np.where(_known(rng, 'Facteur', n), facteur, None)
+    details['Source/Voyage'] = np.where(facteur == 'Importé', _choice(rng, SOURCES, SOURCE_WEIGHTS, n), None)
+    details['Hopital'] = np.where(_known(rng, 'Hopital', n), _choice(rng, HOPITAUX, [1] * len(HOPITAUX), n), None)
+    details['Temps Hospitalisation (j)'] = np.where(_known(rng, 'Temps Hospitalisation (j)', n),
+                                                    rng.integers(2, 30, n), np.nan)
+
+    df = pd.DataFrame({
+        'Date': np.asarray(days_labels)[offsets],
+        'Positif': positive.astype(int),
+        'Negatif': (~positive).astype(int),
+    })
+    for col in COLUMNS[3:]:
+        values = details[col]
+        column = np.full(size, np.nan if values.dtype.kind == 'f' else None, dtype=values.dtype)
+        column[positive] = values
+        df[col] = column
+    return df
+
+
+def generate(rows, path, days=365, seed=0, chunk_size=1000000):
+    rng = np.random.default_rng(seed)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        first = True
+        for start in range(0, rows, chunk_size):
+            size = min(chunk_size, rows - start)
+            # Each chunk covers the whole period; the file is not sorted by date
+            chunk(rng, size, days).to_csv(f, sep=';', index=False, header=first,
+                                          float_format='%.0f')
+            first = False
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.rows, args.path, args.days, args.seed)
+    print("Wrote %d rows to %s" % (args.rows, args.path))
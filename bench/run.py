@@ -0,0 +1,147 @@
+"""Time and memory-profile each stage of the dashboard, headless.
+
+    python bench/run.py 10000 100000 1000000 --out bench/results/current.json
+    python bench/run.py 100000 --compare bench/results/current.json
+
+Case files are generated once per size in bench/data (see generate.py).
+Each stage starts from a cold cache for its own results; `peak_mb` is the
+peak of Python-tracked allocations during the stage.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+os.chdir(ROOT)
+
+import pandas as pd  # noqa: E402
+
+import data  # noqa: E402
+import model  # noqa: E402
+import storage  # noqa: E402
+from generate import generate  # noqa: E402
+
+DATA_DIR = os.path.join('bench', 'data')
+
+
+def _charts(path):
+    specs = [
+        model.evolution_chart(path),
+        model.contamination(path)[1],
+        model.bar_chart('Age', 'Age', 'Patients', path),
+        model.bar_chart('Ville', 'Ville', 'Patients', path),
+        model.bar_chart('Source/Voyage', 'Source/Voyage', 'Patients', path),
+    ]
+    size = sum(len(json.dumps(chart.to_dict())) for chart in specs)
+    try:
+        size += len(model.origin_globe(path).to_json())
+    except ImportError:
+        pass
+    return size
+
+
+def stages(path):
+    yield 'load', lambda: data.load_cases(path)
+    if storage.pa is not None:
+        def reload():
+            data.clear(path)
+            return data.load_cases(path)
+        yield 'load_arrow', reload
+    yield 'evol_cases', lambda: data.evolution(path)
+    yield 'map_summary', lambda: model.map_points(path)
+    yield 'contamination', lambda: model.contamination(path)
+    yield 'population', lambda: model.population(path)
+    yield 'charts', lambda: _charts(path)
+
+
+def measure(path):
+    data.clear(path)
+    arrow = storage.arrow_path(path)
+    if os.path.exists(arrow):
+        os.remove(arrow)
+    results = {}
+    for name, stage in stages(path):
+        # Traced from zero for each stage (reset_peak() needs Python 3.9)
+        tracemalloc.start()
+        start = time.perf_counter()
+        stage()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {'seconds': round(seconds, 4), 'peak_mb': round(peak / 2 ** 20, 2)}
+    data.clear(path)
+    return results
+
+
+def _revision():
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], cwd=ROOT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _warm_imports():
+    # Keep one-off import costs out of the first measured stages
+    for module in ('altair', 'plotly.graph_objects'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def run(sizes, days=365):
+    _warm_imports()
+    report = {
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'pyarrow': storage.pa.__version__ if storage.pa is not None else None,
+        'sizes': {},
+    }
+    for rows in sizes:
+        path = os.path.join(DATA_DIR, 'cases_%d.csv' % rows)
+        if not os.path.exists(path):
+            generate(rows, path, days)
+        report['sizes'][str(rows)] = measure(path)
+    return report
+
+
+def compare(report, baseline):
+    lines = []
+    for rows, results in report['sizes'].items():
+        old = baseline['sizes'].get(rows, {})
+        for name, result in results.items():
+            line = '%10s %-14s %9.3fs %9.1fMB' % (rows, name, result['seconds'], result['peak_mb'])
+            if name in old and old[name]['seconds']:
+                line += '   x%.2f time  x%.2f memory' % (result['seconds'] / old[name]['seconds'],
+                                                       result['peak_mb'] / (old[name]['peak_mb'] or 1))
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sizes', type=int, nargs='+')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.days)
+    baseline = {'sizes': {}}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(compare(report, baseline))
+    if args.out:
+        directory = os.path.dirname(args.out)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
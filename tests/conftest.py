@@ -0,0 +1,29 @@
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules of the app import each other by name, as under `streamlit run`
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import data  # noqa: E402
+import ingest  # noqa: E402
+
+
+@pytest.fixture
+def case_file(tmp_path):
+    """A copy of the case file, with an empty cache for it."""
+    path = str(tmp_path / "COVID_Senegal.csv")
+    shutil.copyfile(os.path.join(ROOT, data.DATA_FILE), path)
+    data.clear()
+    yield path
+    data.clear()
+
+
+def case_rows(path, rows):
+    """Text rows in the columns of `path`, from dicts naming some of them."""
+    columns = ingest._header(path)
+    return pd.DataFrame([dict(dict.fromkeys(columns, ""), **row) for row in rows], columns=columns)
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+
+import data
+import ingest
+import schema
+import storage
+from conftest import case_rows
+
+
+def _append(path, rows):
+    ingest.append(case_rows(path, rows), path)
+
+
+def _full(path, build):
+    data.clear(path)
+    return build(path)
+
+
+def test_factor_counts_with_new_date_and_some_factors(case_file):
+    # The case file does not end a line: the first append is never incremental
+    _append(case_file, [{"Date": "06.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar", "Facteur": "Importé"}])
+    data.contamination(case_file)
+    _append(case_file, [{"Date": "07.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar", "Facteur": "Contact"}])
+    assert data._entry(case_file)["appended"] is not None
+
+    totals, cumulative = data.contamination(case_file)
+    full_totals, full_cumulative = _full(case_file, data.contamination)
+    pd.testing.assert_series_equal(totals, full_totals)
+    pd.testing.assert_frame_equal(cumulative, full_cumulative)
+
+
+def test_ville_and_population_counts(case_file):
+    _append(case_file, [{"Date": "06.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar"}])
+    data.city_summary(case_file)
+    data.population_counts(case_file)
+    _append(case_file, [
+        {"Date": "07.04.20", "Positif": "1", "Negatif": "0", "Age": "40", "Homme": "1", "Femme": "0",
+         "Resident Senegal": "Oui", "Ville": "Kédougou"},
+        {"Date": "07.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar"},
+    ])
+
+    summary = data.city_summary(case_file)
+    population = data.population_counts(case_file)
+    full_summary = _full(case_file, data.city_summary)
+    full_population = data.population_counts(case_file)
+    pd.testing.assert_frame_equal(summary.sort_values('Ville').reset_index(drop=True),
+                                  full_summary.sort_values('Ville').reset_index(drop=True))
+    for col in ('Age', 'Temps Hospitalisation (j)'):
+        assert population[col] == full_population[col]
+    pd.testing.assert_series_equal(population['sexes'], full_population['sexes'])
+    pd.testing.assert_series_equal(population['residents'].sort_index(), full_population['residents'].sort_index())
+
+
+def test_new_facteur_is_reported_and_kept(case_file, tmp_path):
+    incoming = str(tmp_path / "incoming")
+    os.makedirs(incoming)
+    case_rows(case_file, [
+        {"Date": "06.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar", "Facteur": "Voyage"},
+        {"Date": "06.04.20", "Positif": "1", "Negatif": "0", "Ville": "Dakar", "Resident Senegal": "Peut-être"},
+    ]).to_csv(os.path.join(incoming, "new.csv"), sep=";", index=False)
+    ingest.ingest(case_file, incoming)
+
+    totals, _ = data.contamination(case_file)
+    assert totals["Voyage"] == 1
+    _, _, summary = storage.read_checked(case_file)
+    assert [notice["check"] for notice in summary["notices"]] == schema.NOTICES
+    assert os.path.exists(os.path.join(incoming, "rejected", "new.csv"))
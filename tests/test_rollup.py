@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data
+import ingest
+import storage
+from conftest import case_rows
+from rollup import COLUMNS, DailyRollup
+
+
+def _rows(dates, seed):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'Date': pd.to_datetime(dates),
+        **{col: rng.randint(0, 5, len(dates)) for col in COLUMNS},
+    })
+
+
+def _expected(*frames):
+    return pd.concat(frames)[['Date'] + COLUMNS].groupby('Date').sum().cumsum()
+
+
+def _check(rollup, *frames):
+    expected = _expected(*frames)
+    pd.testing.assert_frame_equal(rollup.frame(), expected, check_names=False)
+    assert rollup.totals == {col: int(expected[col].iloc[-1]) for col in COLUMNS}
+
+
+def test_appends_of_late_days_and_unordered_rows():
+    first = _rows(['2020-03-02', '2020-03-05', '2020-03-05', '2020-03-09'] * 5, 0)
+    # Later days, then days before and between the known ones, in no order
+    later = _rows(['2020-03-12', '2020-03-10', '2020-03-12', '2020-03-11'], 1)
+    late = _rows(['2020-03-07', '2020-03-01', '2020-03-05', '2020-03-03', '2020-03-10'], 2)
+
+    rollup = DailyRollup().append(first)
+    _check(rollup, first)
+    rollup.append(later)
+    _check(rollup, first, later)
+    rollup.append(late)
+    _check(rollup, first, later, late)
+    # Enough days to grow the arrays past their initial size
+    many = _rows(pd.date_range('2020-01-01', periods=40).repeat(2).to_series().sample(frac=1, random_state=3), 4)
+    rollup.append(many)
+    _check(rollup, first, later, late, many)
+
+
+def test_copy_is_independent():
+    first = _rows(['2020-03-02', '2020-03-04'], 0)
+    rollup = DailyRollup().append(first)
+    copied = rollup.copy().append(_rows(['2020-03-03', '2020-03-05'], 1))
+    _check(rollup, first)
+    assert len(copied) == 4
+
+
+def test_append_during_a_build_is_counted_once(case_file, monkeypatch):
+    def append(date):
+        ingest.append(case_rows(case_file, [{"Date": date, "Positif": "1", "Negatif": "0", "Ville": "Dakar"}]),
+                      case_file)
+
+    # The case file does not end a line: the first append is never incremental
+    append("06.04.20")
+    data.rollup(case_file)
+    append("07.04.20")
+
+    read_csv_tail = storage.read_csv_tail
+    calls = []
+
+    def slow_read(path, offset, end=None):
+        calls.append(offset)
+        if len(calls) == 1:
+            # The file changes again while this version's rollup is built,
+            # and another session builds the rollup of the newer version
+            append("08.04.20")
+            other = threading.Thread(target=data.rollup, args=(case_file,))
+            other.start()
+            other.join()
+        return read_csv_tail(path, offset, end)
+
+    monkeypatch.setattr(storage, "read_csv_tail", slow_read)
+    data.rollup(case_file)
+    latest = data.rollup(case_file).frame()
+    assert len(calls) == 2
+
+    monkeypatch.setattr(storage, "read_csv_tail", read_csv_tail)
+    data.clear(case_file)
+    pd.testing.assert_frame_equal(latest, data.rollup(case_file).frame())
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+import storage
+
+pytestmark = pytest.mark.skipif(storage.pa is None, reason="pyarrow is not installed")
+
+
+def _mapped_ranges(path):
+    with open("/proc/self/maps") as f:
+        lines = [line.split() for line in f if line.rstrip().endswith(os.path.abspath(path))]
+    return [tuple(int(x, 16) for x in line[0].split("-")) for line in lines]
+
+
+def _copied(df, ranges):
+    copied = []
+    for col in df.columns:
+        values = df[col].values
+        values = np.asarray(values.codes if hasattr(values, "codes") else values)
+        address = values.__array_interface__["data"][0]
+        if not any(low <= address < high for low, high in ranges):
+            copied.append(col)
+    return copied
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc/self/maps")
+@pytest.mark.skipif('.'.join(pd.__version__.split('.')[:2]) not in storage.SHARED_PANDAS,
+                    reason="pandas release not checked for shared columns")
+def test_columns_are_views_of_the_mapping(case_file):
+    storage.convert(case_file, data.content_hash(case_file))
+    df = data.load_cases(case_file)
+    ranges = _mapped_ranges(storage.arrow_path(case_file))
+    assert ranges
+    assert _copied(df, ranges) == []
+
+    # Selecting several columns must not consolidate the blocks into copies
+    df[['Date', 'Positif', 'Negatif', 'Ville', 'Facteur']].groupby('Date').size()
+    data.evolution(case_file)
+    data.contamination(case_file)
+    assert _copied(df, ranges) == []
+
+
+def test_shared_and_copied_frames_agree(case_file):
+    storage.convert(case_file, data.content_hash(case_file))
+    table = storage.pa.ipc.open_file(storage.pa.memory_map(storage.arrow_path(case_file), 'r')).read_all()
+    categories = storage.json.loads(table.schema.metadata[storage.CATEGORIES_KEY])
+    pd.testing.assert_frame_equal(storage._shared_frame(table, categories), storage._copied_frame(table, categories))
+    pd.testing.assert_frame_equal(storage._copied_frame(table, categories), storage.read_csv(case_file))
@@ -0,0 +1,43 @@
+import json
+
+import data
+import ingest
+import warmup
+from conftest import case_rows
+
+
+def _state():
+    with open(warmup.READY_FILE) as f:
+        return json.load(f)
+
+
+def test_stays_ready_while_a_new_version_warms_up_or_fails(case_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(warmup, "READY_FILE", str(tmp_path / "ready.json"))
+    monkeypatch.setattr(warmup, "status", {"state": "cold"})
+    monkeypatch.setattr(warmup, "ready", type(warmup.ready)())
+    jobs = {"rollup": lambda: data.rollup(case_file)}
+    monkeypatch.setattr(warmup, "tasks", lambda path: jobs)
+
+    assert not warmup.check()
+    warmup.warm(case_file)
+    first = data.data_version(case_file)
+    assert _state()["state"] == "ready" and warmup.check()
+
+    ingest.append(case_rows(case_file, [{"Date": "06.04.20", "Positif": "1", "Negatif": "0"}]), case_file)
+    # Before and while the new version warms up
+    assert warmup.check()
+    jobs["check"] = lambda: checked.append(warmup.check())
+    checked = []
+    jobs["broken"] = lambda: 1 / 0
+    warmup.warm(case_file)
+    state = _state()
+    assert checked == [True]
+    assert state["state"] == "ready" and state["version"] == first
+    assert state["rewarm"]["state"] == "failed" and "broken" in state["rewarm"]["errors"]
+    assert warmup.check()
+
+    del jobs["broken"]
+    warmup.warm(case_file)
+    state = _state()
+    assert state["version"] == data.data_version(case_file) and "rewarm" not in state
+    assert warmup.check()